@@ -1,8 +1,15 @@
+from django.conf import settings
+
+from .utils import get_notification_header
+
+
 def notifications_context(request):
     if request.user.is_authenticated:
-        unread_count = request.user.notifications.filter(is_read=False).count()
+        unread_count, recent = get_notification_header(request.user)
     else:
-        unread_count = 0
+        unread_count, recent = 0, []
     return {
         'unread_notifications': unread_count,
-    }
\ No newline at end of file
+        'recent_notifications': recent,
+        'notification_stream_enabled': getattr(settings, 'NOTIFICATION_STREAM_ENABLED', False),
+    }
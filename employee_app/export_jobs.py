@@ -0,0 +1,144 @@
+# employee_app/export_jobs.py
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .exports import EXPORT_SCHEMAS, EXPORT_WRITERS
+from .models import ExportJob
+from .utils import create_notification
+
+PROGRESS_EVERY = 500
+# finished jobs, and their files under MEDIA_ROOT/exports/, are deleted after this
+EXPORT_RETENTION = timedelta(days=7)
+
+_executor = None
+
+
+def _track_progress(job, rows):
+    processed = 0
+    for row in rows:
+        yield row
+        processed += 1
+        if processed % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=job.pk).update(rows_processed=processed)
+    job.rows_processed = processed
+
+
+def run_export_job(job):
+    """
+    Builds the export file for `job`, stores it under MEDIA_ROOT and
+    notifies the requester.
+    """
+    started = time.monotonic()
+    job.status = 'running'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    try:
+        schema = EXPORT_SCHEMAS[job.kind]
+        writer = EXPORT_WRITERS[job.params.get('format', 'xlsx')]
+        queryset = schema.get_queryset(job.params)
+        job.total_rows = queryset.count()
+        job.save(update_fields=['total_rows'])
+
+        with tempfile.TemporaryFile() as tmp:
+            writer.write(tmp, schema, _track_progress(job, schema.rows(queryset)))
+            tmp.seek(0)
+            job.file.save(schema.filename(writer.extension), File(tmp), save=False)
+
+        job.status = 'completed'
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.elapsed_seconds = round(time.monotonic() - started, 2)
+    job.save()
+
+    if job.status == 'completed':
+        create_notification(
+            recipient=job.requested_by,
+            ntype='export_ready',
+            title='Export Ready',
+            message=f"Your {job.get_kind_display()} export ({job.rows_processed} rows) is ready to download.",
+            link=reverse('employee_app:download_export', args=[job.pk]),
+        )
+    else:
+        create_notification(
+            recipient=job.requested_by,
+            ntype='export_failed',
+            title='Export Failed',
+            message=f"Your {job.get_kind_display()} export failed: {job.error}",
+        )
+    return job
+
+
+def _run_in_thread(job_id):
+    close_old_connections()
+    try:
+        job = ExportJob.objects.filter(pk=job_id, status='pending').first()
+        if job:
+            run_export_job(job)
+        purge_exports()
+    finally:
+        close_old_connections()
+
+
+def enqueue_export(user, kind, params=None):
+    """
+    Records an export job. With EXPORT_JOB_RUNNER = 'thread' it is run by
+    an in-process thread pool (development); otherwise the
+    run_export_worker management command picks it up.
+    """
+    global _executor
+    job = ExportJob.objects.create(kind=kind, params=params or {}, requested_by=user)
+
+    if getattr(settings, 'EXPORT_JOB_RUNNER', 'worker') == 'thread':
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='export')
+        transaction.on_commit(lambda: _executor.submit(_run_in_thread, job.pk))
+    return job
+
+
+def claim_next_job():
+    """
+    Atomically moves the oldest pending job to 'running' for a worker.
+    """
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status='pending')
+            .order_by('created_at')
+            .first()
+        )
+        if job:
+            job.status = 'running'
+            job.save(update_fields=['status'])
+        return job
+
+
+def purge_exports(now=None, retention=EXPORT_RETENTION):
+    """
+    Deletes completed and failed jobs that finished more than `retention`
+    ago, together with their files. Returns the number of jobs removed.
+    """
+    cutoff = (now or timezone.now()) - retention
+    jobs = list(ExportJob.objects.filter(status__in=['completed', 'failed'], finished_at__lt=cutoff))
+    for job in jobs:
+        if job.file:
+            directory = os.path.dirname(job.file.path)
+            job.file.delete(save=False)
+            try:
+                os.rmdir(directory)  # the job's random exports/<uuid>/ directory
+            except OSError:
+                pass
+    ExportJob.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+    return len(jobs)
@@ -0,0 +1,413 @@
+# employee_app/exports.py
+import csv
+import itertools
+import json
+import tempfile
+from datetime import datetime
+
+import openpyxl
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font
+
+from .models import Attendance, Batch, BioDataRequest, CustomUser, Session, Submission
+from .search import apply_search
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None
+
+EXPORT_CHUNK_SIZE = 2000
+# Rows buffered to size columns; write-only sheets emit <cols> before data
+AUTO_WIDTH_SAMPLE_ROWS = 1000
+
+
+# ───────────────────────────────────────────────
+# Schemas
+# ───────────────────────────────────────────────
+
+def display(choices):
+    labels = dict(choices)
+    return lambda value: labels.get(value, value)
+
+
+def or_dash(value):
+    return value if value not in (None, '') else '-'
+
+
+def date_format(fmt):
+    return lambda value: value.strftime(fmt) if value else '-'
+
+
+class ExportColumn:
+    """
+    One output column. `source` is a .values() lookup (related fields via
+    `__`) or a tuple of lookups, in which case `format` gets them all.
+    """
+
+    def __init__(self, header, source, format=None):
+        self.header = header
+        self.sources = source if isinstance(source, tuple) else (source,)
+        self.format = format
+
+    def value(self, row):
+        values = [row[source] for source in self.sources]
+        if self.format:
+            return self.format(*values)
+        return values[0]
+
+
+class ExportSchema:
+    """
+    Declarative description of an export: what to query, which columns to
+    emit and which permission module guards it.
+    """
+
+    def __init__(self, name, title, permission, queryset, columns, filename=None, xlsx_options=None):
+        self.name = name
+        self.title = title
+        self.permission = permission
+        self._queryset = queryset
+        self.columns = columns
+        self._filename = filename or name
+        self.xlsx_options = xlsx_options or {}
+
+    @property
+    def headers(self):
+        return [column.header for column in self.columns]
+
+    def get_queryset(self, params=None):
+        return self._queryset(params or {})
+
+    def rows(self, queryset):
+        fields = list(dict.fromkeys(source for column in self.columns for source in column.sources))
+        for row in queryset.values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [column.value(row) for column in self.columns]
+
+    def filename(self, extension):
+        return f"{self._filename.format(today=datetime.now().strftime('%Y-%m-%d'))}.{extension}"
+
+
+EXPORT_SCHEMAS = {}
+
+
+def register_schema(schema):
+    EXPORT_SCHEMAS[schema.name] = schema
+    return schema
+
+
+def approved_employees(search='', department=''):
+    """
+    Approved employees filtered the same way as the biodata list page.
+    """
+    employees = BioDataRequest.objects.filter(status='approved').order_by('-doj')
+
+    if search:
+        # full-text match, best first
+        employees = apply_search(employees, 'biodata', search)
+
+    if department:
+        employees = employees.filter(department=department)
+
+    return employees
+
+
+def filtered_users(search='', role='', department='', status=''):
+    """
+    Users filtered the same way as the users manager page, newest first.
+    """
+    users = CustomUser.objects.order_by('-date_joined', '-pk')
+
+    if search:
+        # keep the date order the users manager pages on
+        users = apply_search(users, 'user', search, rank=False)
+    if role:
+        users = users.filter(role=role)
+    if department:
+        users = users.filter(department=department)
+    if status:
+        users = users.filter(status=status)
+
+    return users
+
+
+def biodata_address(line1, line2, city, state, postal_code, country):
+    country = dict(BioDataRequest.COUNTRY_CHOICES).get(country, country)
+    address = f"{line1 or ''} {line2 or ''}, {city or ''}, {state or ''} {postal_code or ''}, {country or ''}".strip()
+    return address or '-'
+
+
+register_schema(ExportSchema(
+    'users', 'Users', 'users',
+    lambda params: filtered_users(
+        params.get('search', ''), params.get('role', ''), params.get('department', ''), params.get('status', ''),
+    ),
+    [
+        ExportColumn('Full Name', 'full_name', or_dash),
+        ExportColumn('Email', 'email'),
+        ExportColumn('Phone', 'phone', or_dash),
+        ExportColumn('Department', 'department', display(CustomUser.DEPARTMENT_CHOICES)),
+        ExportColumn('Role', 'role', display(CustomUser.ROLE_CHOICES)),
+        ExportColumn('Status', 'status', display(CustomUser.STATUS_CHOICES)),
+        ExportColumn('Date Joined', 'date_joined', date_format('%Y-%m-%d')),
+    ],
+))
+
+register_schema(ExportSchema(
+    'biodata', 'Approved Employees', 'biodata',
+    lambda params: approved_employees(params.get('search', ''), params.get('department', '')),
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('First Name', 'first_name'),
+        ExportColumn('Middle Name', 'middle_name', or_dash),
+        ExportColumn('Last Name', 'last_name'),
+        ExportColumn('Personal Email', 'personal_email'),
+        ExportColumn('Contact Number', 'contact_number'),
+        ExportColumn('Employee ID', 'employee_id', or_dash),
+        ExportColumn('Official Email', 'official_email', or_dash),
+        ExportColumn('Designation', 'designation', or_dash),
+        ExportColumn('Department', 'department', or_dash),
+        ExportColumn('DOJ', 'doj', date_format('%Y-%m-%d')),
+        ExportColumn('Work Mode', 'work_mode', or_dash),
+        ExportColumn('Experience Type', 'experience_type', display(BioDataRequest.EXPERIENCE_TYPE_CHOICES)),
+        ExportColumn('Post Applied For', 'post_applied_for',
+                     lambda value: or_dash(dict(BioDataRequest.POST_APPLIED_FOR_CHOICES).get(value, value))),
+        ExportColumn('Blood Group', 'blood_group', or_dash),
+        ExportColumn('Address', ('address_line1', 'address_line2', 'city', 'state', 'postal_code', 'country'),
+                     biodata_address),
+        ExportColumn('Aadhar No', 'aadhar_no', or_dash),
+        ExportColumn('PAN No', 'pan_no', or_dash),
+        ExportColumn('Bank Name', 'bank_name', or_dash),
+        ExportColumn('Branch', 'bank_branch', or_dash),
+        ExportColumn('Account No', 'account_number', or_dash),
+        ExportColumn('Account Name', 'account_name', or_dash),
+        ExportColumn('IFSC', 'ifsc_code', or_dash),
+        ExportColumn('Technical Skills', 'technical_skills'),
+        ExportColumn('Created At', 'created_at', date_format('%Y-%m-%d %H:%M')),
+    ],
+    filename='approved_employees_{today}',
+    xlsx_options={'freeze_header': True, 'header_alignment': 'center', 'auto_width': True},
+))
+
+register_schema(ExportSchema(
+    'batches', 'Batches', 'training',
+    lambda params: Batch.objects.order_by('pk'),
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('Name', 'name'),
+        ExportColumn('Batch Code', 'batch_code', or_dash),
+        ExportColumn('Start Date', 'start_date', date_format('%Y-%m-%d')),
+        ExportColumn('End Date', 'end_date', date_format('%Y-%m-%d')),
+        ExportColumn('Status', 'status'),
+        ExportColumn('Active', 'is_active'),
+        ExportColumn('Created By', 'created_by__email', or_dash),
+        ExportColumn('Created At', 'created_at', date_format('%Y-%m-%d %H:%M')),
+    ],
+))
+
+register_schema(ExportSchema(
+    'sessions', 'Sessions', 'training',
+    lambda params: Session.objects.order_by('pk'),
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('Title', 'title'),
+        ExportColumn('Batch', 'batch__name'),
+        ExportColumn('Trainer', 'trainer__email', or_dash),
+        ExportColumn('Date/Time', 'date_time', date_format('%Y-%m-%d %H:%M')),
+        ExportColumn('Duration (hrs)', 'duration_hours'),
+        ExportColumn('Status', 'status'),
+        ExportColumn('Attendance Taken', 'attendance_taken'),
+    ],
+))
+
+register_schema(ExportSchema(
+    'attendance', 'Attendance', 'training',
+    lambda params: Attendance.objects.order_by('pk'),
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('Session', 'session__title'),
+        ExportColumn('Batch', 'session__batch__name'),
+        ExportColumn('Employee', 'employee__email'),
+        ExportColumn('Status', 'status'),
+        ExportColumn('Notes', 'notes', or_dash),
+        ExportColumn('Marked By', 'marked_by__email', or_dash),
+        ExportColumn('Marked At', 'marked_at', date_format('%Y-%m-%d %H:%M')),
+    ],
+))
+
+register_schema(ExportSchema(
+    'submissions', 'Submissions', 'training',
+    lambda params: Submission.objects.order_by('pk'),
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('Assignment', 'assignment__title'),
+        ExportColumn('Batch', 'assignment__batch__name'),
+        ExportColumn('Employee', 'employee__email'),
+        ExportColumn('Submitted At', 'submitted_at', date_format('%Y-%m-%d %H:%M')),
+        ExportColumn('Score', 'score', or_dash),
+        ExportColumn('Graded By', 'graded_by__email', or_dash),
+        ExportColumn('Graded At', 'graded_at', date_format('%Y-%m-%d %H:%M')),
+        ExportColumn('Feedback', 'feedback', or_dash),
+    ],
+))
+
+
+# ───────────────────────────────────────────────
+# Writers
+# ───────────────────────────────────────────────
+
+def column_widths(columns, rows):
+    """
+    Running per-column maxima of str(value) length, header included.
+    """
+    widths = [len(str(column)) for column in columns]
+    for row in rows:
+        for index, value in enumerate(row):
+            length = len(str(value))
+            if length > widths[index]:
+                widths[index] = length
+    return [width + 2 for width in widths]
+
+
+def write_xlsx(fileobj, sheet_title, columns, rows, freeze_header=False, header_alignment=None, auto_width=False):
+    """
+    Writes `rows` to `fileobj` with openpyxl's write-only mode, which
+    spools rows to disk instead of keeping every cell in memory.
+    With `auto_width`, column widths are sized from the first
+    AUTO_WIDTH_SAMPLE_ROWS rows while they are generated.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+
+    rows = iter(rows)
+    if auto_width:
+        sample = list(itertools.islice(rows, AUTO_WIDTH_SAMPLE_ROWS))
+        widths = column_widths(columns, sample)
+        rows = itertools.chain(sample, rows)
+    else:
+        widths = [len(column) + 6 for column in columns]
+    for index, width in enumerate(widths, start=1):
+        ws.column_dimensions[openpyxl.utils.get_column_letter(index)].width = width
+
+    if freeze_header:
+        ws.freeze_panes = 'A2'
+
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(ws, value=column)
+        cell.font = Font(bold=True)
+        if header_alignment:
+            cell.alignment = Alignment(horizontal=header_alignment)
+        header.append(cell)
+    ws.append(header)
+
+    for row in rows:
+        ws.append(row)
+    wb.save(fileobj)
+
+
+class _Echo:
+    # csv.writer target that hands each formatted line straight back
+    def write(self, value):
+        return value
+
+
+def _json_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class XlsxWriter:
+    extension = 'xlsx'
+    content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    binary = True
+
+    def write(self, fileobj, schema, rows):
+        write_xlsx(fileobj, schema.title, schema.headers, rows, **schema.xlsx_options)
+
+
+class CsvWriter:
+    extension = 'csv'
+    content_type = 'text/csv'
+    binary = False
+
+    def lines(self, schema, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(schema.headers)
+        for row in rows:
+            yield writer.writerow(row)
+
+    def write(self, fileobj, schema, rows):
+        for line in self.lines(schema, rows):
+            fileobj.write(line.encode('utf-8'))
+
+
+class JsonLinesWriter:
+    extension = 'jsonl'
+    content_type = 'application/x-ndjson'
+    binary = False
+
+    def lines(self, schema, rows):
+        headers = schema.headers
+        for row in rows:
+            yield json.dumps(
+                {header: _json_value(value) for header, value in zip(headers, row)}
+            ) + '\n'
+
+    def write(self, fileobj, schema, rows):
+        for line in self.lines(schema, rows):
+            fileobj.write(line.encode('utf-8'))
+
+
+class ParquetWriter:
+    extension = 'parquet'
+    content_type = 'application/vnd.apache.parquet'
+    binary = True
+
+    def write(self, fileobj, schema, rows):
+        # Values are already formatted for display, so every column is text
+        arrow_schema = pyarrow.schema([(header, pyarrow.string()) for header in schema.headers])
+        rows = iter(rows)
+        with pyarrow.parquet.ParquetWriter(fileobj, arrow_schema) as writer:
+            while True:
+                chunk = list(itertools.islice(rows, EXPORT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                columns = [
+                    pyarrow.array([None if value is None else str(value) for value in column], pyarrow.string())
+                    for column in zip(*chunk)
+                ]
+                writer.write_batch(pyarrow.record_batch(columns, schema=arrow_schema))
+
+
+EXPORT_WRITERS = {
+    'xlsx': XlsxWriter(),
+    'csv': CsvWriter(),
+    'jsonl': JsonLinesWriter(),
+}
+if pyarrow is not None:
+    EXPORT_WRITERS['parquet'] = ParquetWriter()
+
+
+def export_response(schema, fmt, params=None):
+    """
+    HTTP response for an export. Text formats stream row by row; binary
+    containers (XLSX zip, Parquet footer) are spooled to a temporary file
+    and streamed back in chunks, so memory stays flat either way.
+    """
+    writer = EXPORT_WRITERS[fmt]
+    rows = schema.rows(schema.get_queryset(params))
+    filename = schema.filename(writer.extension)
+
+    if not writer.binary:
+        response = StreamingHttpResponse(writer.lines(schema, rows), content_type=writer.content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    tmp = tempfile.TemporaryFile()
+    writer.write(tmp, schema, rows)
+    tmp.seek(0)
+    return FileResponse(tmp, as_attachment=True, filename=filename, content_type=writer.content_type)
@@ -445,4 +445,18 @@ class SubmissionForm(forms.ModelForm):
         fields = ['file']
         widgets = {
             'file': forms.FileInput(attrs={'accept': '.zip,.pdf,.py,.docx,.jpg,.png'}),
-        }
\ No newline at end of file
+        }
+
+# Bulk invitation upload (CSV/XLSX with name, email, phone columns)
+class InvitationImportForm(forms.Form):
+    file = forms.FileField(
+        widget=forms.FileInput(attrs={'accept': '.csv,.xlsx'}),
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        if not file.name.lower().endswith(('.csv', '.xlsx')):
+            raise ValidationError('Only CSV or XLSX files are allowed.')
+        if file.size > 5 * 1024 * 1024:
+            raise ValidationError('File too large (max 5MB)')
+        return file
@@ -0,0 +1,127 @@
+# employee_app/invitations.py
+import csv
+import io
+
+import openpyxl
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .mailer import queue_emails
+from .metrics import bump
+from .models import BiodataInvitation, BioDataRequest, CustomUser
+
+LOOKUP_CHUNK_SIZE = 1000
+
+SKIP_REASONS = {
+    'invalid': 'missing name or invalid email',
+    'duplicate': 'duplicate in file',
+    'submitted': 'already submitted bio data',
+    'registered': 'already a user account',
+    'invited': 'already invited',
+}
+
+
+def read_invitation_file(upload):
+    """
+    Yields {'name', 'email', 'phone'} dicts from an uploaded CSV or XLSX.
+    The first row is a header; columns are matched by name.
+    """
+    wb = None
+    if upload.name.lower().endswith('.xlsx'):
+        wb = openpyxl.load_workbook(upload, read_only=True, data_only=True)
+        rows = wb.active.iter_rows(values_only=True)
+    else:
+        rows = csv.reader(io.TextIOWrapper(upload, encoding='utf-8-sig'))
+
+    try:
+        header = None
+        for row in rows:
+            cells = ['' if value is None else str(value).strip() for value in row]
+            if header is None:
+                header = [cell.lower() for cell in cells]
+                continue
+            record = dict(zip(header, cells))
+            yield {
+                'name': record.get('name', ''),
+                'email': record.get('email', '').lower(),
+                'phone': record.get('phone', ''),
+            }
+    finally:
+        # read-only workbooks keep the file open until closed
+        if wb is not None:
+            wb.close()
+
+
+def _existing(model, fields, emails):
+    """
+    The addresses in `emails` (lowercase) stored in any of `fields` of
+    `model`, compared case-insensitively. Set-based `__in` lookups, chunked
+    to keep the IN lists bounded.
+    """
+    emails = list(emails)
+    lowered = {f'{field}_lower': Lower(field) for field in fields}
+    found = set()
+    for i in range(0, len(emails), LOOKUP_CHUNK_SIZE):
+        chunk = emails[i:i + LOOKUP_CHUNK_SIZE]
+        match = Q()
+        for alias in lowered:
+            match |= Q(**{f'{alias}__in': chunk})
+        for values in model.objects.annotate(**lowered).filter(match).values_list(*lowered):
+            found.update(value for value in values if value)
+    return found
+
+
+def import_invitations(records, email_for):
+    """
+    Deduplicates `records` against the file itself, BioDataRequest,
+    CustomUser and BiodataInvitation with a few set-based queries, then
+    creates the invitations and their emails in bulk.
+    `email_for(name)` returns the (subject, message) of the invitation.
+    Returns (accepted, skipped) where skipped maps reason -> count.
+    """
+    skipped = dict.fromkeys(SKIP_REASONS, 0)
+    candidates = {}
+    for record in records:
+        try:
+            validate_email(record['email'])
+        except ValidationError:
+            skipped['invalid'] += 1
+            continue
+        if not record['name']:
+            skipped['invalid'] += 1
+        elif record['email'] in candidates:
+            skipped['duplicate'] += 1
+        else:
+            candidates[record['email']] = record
+
+    submitted = _existing(BioDataRequest, ('personal_email', 'official_email'), candidates)
+    registered = _existing(CustomUser, ('email',), candidates)
+    invited = _existing(BiodataInvitation, ('email',), candidates)
+
+    accepted = []
+    for email, record in candidates.items():
+        if email in submitted:
+            skipped['submitted'] += 1
+        elif email in registered:
+            skipped['registered'] += 1
+        elif email in invited:
+            skipped['invited'] += 1
+        else:
+            accepted.append(record)
+
+    with transaction.atomic():
+        BiodataInvitation.objects.bulk_create([
+            BiodataInvitation(name=record['name'], email=record['email'], phone=record['phone'])
+            for record in accepted
+        ])
+        # bulk_create skips the save signals that maintain the dashboard rollup
+        bump({}, {('invitations_sent', ''): len(accepted)})
+        queue_emails(
+            (*email_for(record['name']), [record['email']])
+            for record in accepted
+        )
+
+    return len(accepted), skipped
@@ -0,0 +1,150 @@
+# employee_app/mailer.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+MAX_ATTEMPTS = 5
+MAX_BACKOFF_SECONDS = 60 * 60
+# bodies can carry credentials (e.g. the welcome mail's temporary password),
+# so they are wiped once a message is sent or has failed for good
+REDACTED_BODY = '[redacted after delivery]'
+OUTBOX_RETENTION = timedelta(days=30)
+
+_executor = None
+
+
+def queue_email(subject, message, recipient_list, from_email=None):
+    """
+    Drop-in for send_mail(): stores the message in the outbox instead of
+    talking to SMTP inside the request. Call it inside the same
+    transaction.atomic() block as the change the mail is about.
+    """
+    email = EmailOutbox.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+    )
+    if getattr(settings, 'EMAIL_OUTBOX_RUNNER', 'worker') == 'thread':
+        transaction.on_commit(_deliver_in_background)
+    return email
+
+
+def queue_emails(messages, from_email=None):
+    """
+    Bulk version of queue_email(): `messages` is an iterable of
+    (subject, message, recipient_list) tuples, stored with one INSERT.
+    """
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    emails = EmailOutbox.objects.bulk_create([
+        EmailOutbox(subject=subject, body=message, from_email=from_email, to=list(recipient_list))
+        for subject, message, recipient_list in messages
+    ])
+    if emails and getattr(settings, 'EMAIL_OUTBOX_RUNNER', 'worker') == 'thread':
+        transaction.on_commit(_deliver_in_background)
+    return emails
+
+
+def _deliver_in_background():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+    _executor.submit(_deliver_in_thread)
+
+
+def _deliver_in_thread():
+    close_old_connections()
+    try:
+        # keep draining so a bulk enqueue doesn't sit behind one batch
+        while any(deliver_outbox()):
+            pass
+        purge_outbox()
+    finally:
+        close_old_connections()
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS))
+
+
+def _claim_batch(batch_size):
+    with transaction.atomic():
+        emails = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        # Push them out of reach of other workers while we send
+        EmailOutbox.objects.filter(pk__in=[e.pk for e in emails]).update(
+            next_attempt_at=timezone.now() + timedelta(minutes=10)
+        )
+    return emails
+
+
+def deliver_outbox(batch_size=50, rate=None):
+    """
+    Sends one batch of due messages over a single SMTP connection.
+    `rate` caps messages per second. Returns (sent, failed).
+    """
+    emails = _claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # SMTP server unreachable: retry the whole batch later
+        EmailOutbox.objects.filter(pk__in=[email.pk for email in emails]).update(
+            next_attempt_at=timezone.now() + backoff(1), last_error=str(e)
+        )
+        return 0, 0
+
+    sent = failed = 0
+    try:
+        for email in emails:
+            try:
+                EmailMessage(
+                    email.subject, email.body, email.from_email, email.to, connection=connection
+                ).send()
+            except Exception as e:
+                email.attempts += 1
+                email.last_error = str(e)
+                if email.attempts >= MAX_ATTEMPTS:
+                    email.status = 'failed'
+                    email.body = REDACTED_BODY
+                else:
+                    email.next_attempt_at = timezone.now() + backoff(email.attempts)
+                email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at', 'body'])
+                failed += 1
+            else:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.attempts += 1
+                email.body = REDACTED_BODY
+                email.save(update_fields=['status', 'sent_at', 'attempts', 'body'])
+                sent += 1
+
+            if rate:
+                time.sleep(1 / rate)
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def purge_outbox(now=None, retention=OUTBOX_RETENTION):
+    """
+    Deletes sent and permanently failed messages older than `retention`.
+    Returns the number of rows removed.
+    """
+    cutoff = (now or timezone.now()) - retention
+    deleted, _ = EmailOutbox.objects.filter(status__in=['sent', 'failed'], created_at__lt=cutoff).delete()
+    return deleted
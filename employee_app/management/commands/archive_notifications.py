@@ -0,0 +1,64 @@
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employee_app.models import Notification
+from employee_app.utils import invalidate_recent_feed
+
+
+class Command(BaseCommand):
+    help = "Archive read notifications older than --days to a JSONL file and delete them in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90,
+                            help='Archive read notifications older than this many days (default: 90).')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows archived and deleted per batch (default: 1000).')
+        parser.add_argument('--output', default=None,
+                            help='JSONL file to append to (default: archive/notifications-<date>.jsonl).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many rows would be archived.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        batch_size = options['batch_size']
+        queryset = Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} notifications would be archived (older than {cutoff:%Y-%m-%d}).")
+            return
+
+        output = options['output']
+        if not output:
+            archive_dir = settings.BASE_DIR / 'archive'
+            archive_dir.mkdir(exist_ok=True)
+            output = archive_dir / f"notifications-{timezone.now():%Y%m%d}.jsonl"
+
+        fields = ('id', 'recipient_id', 'notification_type', 'title', 'message', 'link', 'created_at')
+        archived = 0
+        started = time.monotonic()
+
+        with open(output, 'a', encoding='utf-8') as fh:
+            while True:
+                rows = list(queryset.order_by('pk').values(*fields)[:batch_size])
+                if not rows:
+                    break
+
+                for row in rows:
+                    row['created_at'] = row['created_at'].isoformat()
+                    fh.write(json.dumps(row) + '\n')
+                fh.flush()
+
+                Notification.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+                invalidate_recent_feed({row['recipient_id'] for row in rows})
+                archived += len(rows)
+
+        elapsed = time.monotonic() - started
+        rate = archived / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} notifications to {output} in {elapsed:.1f}s ({rate:.0f} rows/s)."
+        ))
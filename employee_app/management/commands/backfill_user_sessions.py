@@ -0,0 +1,37 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employee_app.models import CustomUser, UserSession
+
+
+class Command(BaseCommand):
+    help = "Populate the UserSession index from existing unexpired django_session rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Index rows inserted per batch (default: 1000).')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        user_ids = set(CustomUser.objects.values_list('pk', flat=True))
+        sessions = Session.objects.filter(expire_date__gte=timezone.now())
+
+        batch = []
+        indexed = 0
+        for session in sessions.iterator(chunk_size=batch_size):
+            user_id = session.get_decoded().get('_auth_user_id')
+            if not user_id or int(user_id) not in user_ids:
+                continue
+            batch.append(UserSession(
+                user_id=int(user_id),
+                session_key=session.session_key,
+                expire_date=session.expire_date,
+            ))
+            if len(batch) >= batch_size:
+                indexed += len(UserSession.objects.bulk_create(batch, ignore_conflicts=True))
+                batch = []
+        if batch:
+            indexed += len(UserSession.objects.bulk_create(batch, ignore_conflicts=True))
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} sessions."))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from employee_app.models import CustomUser
+
+ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+class Command(BaseCommand):
+    help = "Compare requests/sec and django_session queries per request across session engines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500,
+                            help='Authenticated requests issued per engine (default: 500).')
+        parser.add_argument('--path', default='/notifications/poll/',
+                            help='URL to request (default: the notification poll endpoint).')
+
+    def handle(self, *args, **options):
+        for engine in ENGINES:
+            with override_settings(SESSION_ENGINE=engine, ALLOWED_HOSTS=['*']):
+                rps, session_queries = self._run(options['path'], options['requests'])
+            self.stdout.write(
+                f"{engine.rsplit('.', 1)[-1]:>10}: {rps:8.1f} req/s, "
+                f"{session_queries:.2f} django_session queries/request"
+            )
+
+    def _run(self, path, count):
+        # Everything happens in a transaction that is rolled back
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(
+                'session-benchmark@example.invalid', role='super_admin'
+            )
+            client = Client()
+            client.force_login(user)
+            client.get(path)  # warm up
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(count):
+                    client.get(path)
+                elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        session_queries = sum('django_session' in q['sql'] for q in queries.captured_queries)
+        return count / elapsed, session_queries / count
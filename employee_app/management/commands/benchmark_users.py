@@ -0,0 +1,97 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from employee_app.exports import filtered_users
+from employee_app.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the users manager at scale: keyset pages (first, deep, filtered) "
+        "against OFFSET paging at the same depth, plus the page and JSON views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000,
+                            help='Synthetic users to create (default: 50000).')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Timed runs per measurement (default: 20).')
+
+    def handle(self, *args, **options):
+        # Everything happens in a transaction that is rolled back
+        with transaction.atomic():
+            self._populate(options['users'])
+            self._report(options['users'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def _populate(self, count):
+        started = time.perf_counter()
+        roles = [r for r, _ in CustomUser.ROLE_CHOICES]
+        departments = [d for d, _ in CustomUser.DEPARTMENT_CHOICES]
+        now = timezone.now()
+        rng = random.Random(42)
+        CustomUser.objects.bulk_create([
+            CustomUser(
+                email=f'bench-user-{i}@example.invalid',
+                full_name=f'Bench User {i}',
+                role=rng.choice(roles),
+                department=rng.choice(departments),
+                status='active' if rng.random() < 0.9 else 'inactive',
+                date_joined=now - timedelta(minutes=i),
+                password='!',
+            )
+            for i in range(count)
+        ], batch_size=2000)
+        self.stdout.write(f"Created {count} users in {time.perf_counter() - started:.1f}s")
+
+    def _time(self, fn, repeat):
+        fn()  # warm up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - started) / repeat * 1000
+
+    def _report(self, count, repeat):
+        from employee_app.views import USERS_PAGE_SIZE
+
+        depth = count // 2
+        base = filtered_users()
+        middle = base[depth:depth + 1].get()
+        keyset_deep = lambda: list(
+            base.filter(
+                Q(date_joined__lte=middle.date_joined),
+                Q(date_joined__lt=middle.date_joined) | Q(pk__lt=middle.pk),
+            )[:USERS_PAGE_SIZE + 1]
+        )
+        offset_deep = lambda: list(base[depth:depth + USERS_PAGE_SIZE + 1])
+
+        rows = [
+            ('keyset, first page', lambda: list(base[:USERS_PAGE_SIZE + 1])),
+            (f'keyset, row {depth}', keyset_deep),
+            (f'OFFSET {depth}', offset_deep),
+            ('keyset, role=trainer', lambda: list(filtered_users(role='trainer')[:USERS_PAGE_SIZE + 1])),
+            ('keyset, department=hr, status=inactive',
+             lambda: list(filtered_users(department='hr', status='inactive')[:USERS_PAGE_SIZE + 1])),
+        ]
+        for label, fn in rows:
+            self.stdout.write(f"{label:>42}: {self._time(fn, repeat):8.2f} ms")
+
+        admin = CustomUser.objects.create_user('users-benchmark@example.invalid', role='super_admin')
+        with override_settings(ALLOWED_HOSTS=['*']):
+            client = Client()
+            client.force_login(admin)
+            cursor = f"{middle.date_joined.isoformat()}_{middle.pk}"
+            views = [
+                ('users/ page (HTML)', lambda: client.get('/users/')),
+                ('users/data/ deep page (JSON)', lambda: client.get('/users/data/', {'after': cursor})),
+            ]
+            for label, fn in views:
+                self.stdout.write(f"{label:>42}: {self._time(fn, repeat):8.2f} ms")
@@ -0,0 +1,69 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from employee_app.models import BioDataRequest, StoredBlob
+from employee_app.storage import DOCUMENT_ROOT, document_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount references to content-addressed documents and delete files "
+        "that no biodata record points at any more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Leave orphans younger than this alone, so in-flight uploads survive (default: 24).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be deleted without deleting anything.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        dry_run = options['dry_run']
+
+        references = Counter()
+        rows = BioDataRequest.objects.only(*BioDataRequest.DOCUMENT_FIELDS, 'work_experience')
+        for bio in rows.iterator(chunk_size=1000):
+            references.update(n for n in bio.document_names() if n.startswith(DOCUMENT_ROOT + '/'))
+
+        fixed = 0
+        orphans = []
+        for blob in StoredBlob.objects.iterator(chunk_size=1000):
+            count = references.get(blob.name, 0)
+            if count != blob.refcount:
+                fixed += 1
+                if not dry_run:
+                    StoredBlob.objects.filter(pk=blob.pk).update(refcount=count)
+            if count == 0 and blob.created_at < cutoff:
+                orphans.append(blob.name)
+
+        if orphans and not dry_run:
+            with transaction.atomic():
+                StoredBlob.objects.filter(name__in=orphans, refcount=0).delete()
+                transaction.on_commit(lambda: document_storage.remove_unreferenced(orphans))
+
+        # files on disk with no StoredBlob row at all (e.g. a crash between write and insert)
+        known = set(StoredBlob.objects.values_list('name', flat=True))
+        strays = []
+        root = document_storage.path(DOCUMENT_ROOT)
+        cutoff_ts = cutoff.timestamp()
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, document_storage.location).replace(os.sep, '/')
+                if name not in known and name not in references and os.path.getmtime(path) < cutoff_ts:
+                    strays.append(name)
+        if not dry_run:
+            for name in strays:
+                document_storage.delete(name)
+
+        prefix = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {len(orphans)} orphaned and {len(strays)} untracked documents; "
+            f"corrected {fixed} refcounts."
+        ))
@@ -0,0 +1,32 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from employee_app.models import BioDataRequest
+from employee_app.thumbnails import EAGER_THUMBNAILS, generate_thumbnail, thumbnail_name
+
+
+class Command(BaseCommand):
+    help = "Build (or rebuild) cached thumbnails for existing biodata photos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate derivatives that already exist.')
+
+    def handle(self, *args, **options):
+        names = (
+            BioDataRequest.objects.exclude(photo='')
+            .values_list('photo', flat=True)
+            .iterator(chunk_size=1000)
+        )
+
+        built = failed = 0
+        for name in names:
+            for size, fmt in EAGER_THUMBNAILS:
+                if not options['force'] and default_storage.exists(thumbnail_name(name, size, fmt)):
+                    continue
+                if generate_thumbnail(name, size, fmt):
+                    built += 1
+                else:
+                    failed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Built {built} thumbnails ({failed} failed)."))
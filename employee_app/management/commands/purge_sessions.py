@@ -0,0 +1,41 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employee_app.models import UserSession
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions (and their UserSession index rows) in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows deleted per statement (default: 5000).')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to sleep between batches to ease lock pressure.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        started = time.monotonic()
+
+        purged = self._purge(Session.objects.filter(expire_date__lt=now), 'session_key', batch_size, options['pause'])
+        indexed = self._purge(UserSession.objects.filter(expire_date__lt=now), 'pk', batch_size, options['pause'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {purged} expired sessions and {indexed} index rows in {elapsed:.1f}s."
+        ))
+
+    def _purge(self, queryset, key_field, batch_size, pause):
+        total = 0
+        while True:
+            keys = list(queryset.values_list(key_field, flat=True)[:batch_size])
+            if not keys:
+                return total
+            deleted, _ = queryset.model.objects.filter(**{f'{key_field}__in': keys}).delete()
+            total += deleted
+            if pause:
+                time.sleep(pause)
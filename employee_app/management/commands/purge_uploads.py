@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from employee_app.uploads import UPLOAD_EXPIRY, purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete chunked uploads that were abandoned before the biodata form was submitted."
+
+    def handle(self, *args, **options):
+        purged = purge_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {purged} uploads idle for more than {UPLOAD_EXPIRY}."
+        ))
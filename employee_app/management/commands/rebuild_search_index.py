@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from employee_app.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the biodata/user search documents from scratch (run once after migrating)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Documents inserted per batch (default: 500).')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with transaction.atomic():
+            written = rebuild_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {written} documents in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employee_app.talent import rebuild_talent_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the skill/employer index from every biodata request (run once after migrating)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Terms inserted per batch (default: 500).')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = rebuild_talent_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {written} skill/employer terms in {time.monotonic() - started:.1f}s."
+        ))
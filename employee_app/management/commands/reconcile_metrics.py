@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from employee_app.metrics import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the dashboard metrics rollup from the source tables and fix "
+        "any counters that drifted (run nightly)."
+    )
+
+    def handle(self, *args, **options):
+        drifted = reconcile()
+        for metric, dimension in drifted:
+            self.stdout.write(f"Corrected {metric}[{dimension}]")
+        self.stdout.write(self.style.SUCCESS(f"Reconciled metrics; {len(drifted)} counters corrected."))
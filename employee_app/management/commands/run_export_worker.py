@@ -0,0 +1,39 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from employee_app.export_jobs import EXPORT_RETENTION, claim_next_job, purge_exports, run_export_job
+
+
+class Command(BaseCommand):
+    help = "Process pending export jobs. Runs until interrupted unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the pending queue and exit.')
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Seconds to wait when the queue is empty (default: 2).')
+        parser.add_argument('--retention-days', type=float, default=EXPORT_RETENTION.days,
+                            help=f'Delete finished exports older than this (default: {EXPORT_RETENTION.days}).')
+
+    def handle(self, *args, **options):
+        next_purge = 0
+        while True:
+            job = claim_next_job()
+            if job is None:
+                # queue drained: drop expired exports (hourly while running)
+                if time.monotonic() >= next_purge:
+                    purged = purge_exports(retention=timedelta(days=options['retention_days']))
+                    if purged:
+                        self.stdout.write(f"Purged {purged} expired exports")
+                    next_purge = time.monotonic() + 60 * 60
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            run_export_job(job)
+            self.stdout.write(
+                f"Export #{job.pk} {job.status}: {job.rows_processed} rows in {job.elapsed_seconds}s"
+            )
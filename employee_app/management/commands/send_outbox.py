@@ -0,0 +1,44 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from employee_app.mailer import OUTBOX_RETENTION, deliver_outbox, purge_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails in batches over one SMTP connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='Messages sent per SMTP connection (default: 50).')
+        parser.add_argument('--rate', type=float, default=None,
+                            help='Maximum messages per second.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for new messages instead of exiting when drained.')
+        parser.add_argument('--sleep', type=float, default=5.0,
+                            help='Seconds to wait when the outbox is empty in --loop mode (default: 5).')
+        parser.add_argument('--retention-days', type=float, default=OUTBOX_RETENTION.days,
+                            help=f'Delete sent/failed messages older than this (default: {OUTBOX_RETENTION.days}).')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        next_purge = 0
+        while True:
+            sent, failed = deliver_outbox(options['batch_size'], options['rate'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"Batch: {sent} sent, {failed} failed")
+                continue
+            # outbox drained: drop old delivered rows (hourly in --loop mode)
+            if time.monotonic() >= next_purge:
+                purged = purge_outbox(retention=timedelta(days=options['retention_days']))
+                if purged:
+                    self.stdout.write(f"Purged {purged} old messages")
+                next_purge = time.monotonic() + 60 * 60
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_sent} sent, {total_failed} failed."))
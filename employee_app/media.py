@@ -0,0 +1,181 @@
+# employee_app/media.py
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+from .models import BioDataRequest, ExportJob, Submission
+from .thumbnails import THUMBNAIL_ROOT, thumbnail_dir
+from .utils import has_permission
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+MEDIA_CACHE_SECONDS = 60 * 60
+# as FileResponse does: compressed files are served as what they are, not with a
+# Content-Encoding the browser would silently undo
+ENCODED_CONTENT_TYPES = {
+    'br': 'application/x-brotli',
+    'bzip2': 'application/x-bzip',
+    'compress': 'application/x-compress',
+    'gzip': 'application/gzip',
+    'xz': 'application/x-xz',
+}
+
+# top-level MEDIA_ROOT directories that hold biodata files
+BIODATA_PREFIXES = ('biodata/', 'documents/', THUMBNAIL_ROOT + '/')
+
+
+def _own_biodata_files(user):
+    try:
+        bio = user.bio_data_request
+    except BioDataRequest.DoesNotExist:
+        return set()
+    names = set(bio.document_names())
+    if bio.photo:
+        names.add(bio.photo.name)
+        names.add(thumbnail_dir(bio.photo.name))
+    return names
+
+
+def can_access_media(user, path):
+    """
+    Whether `user` may read MEDIA_ROOT/`path`. Biodata files need the biodata
+    view permission or must belong to the user's own biodata.
+    """
+    if path.startswith(BIODATA_PREFIXES):
+        if has_permission(user, 'biodata', 'view'):
+            return True
+        own = _own_biodata_files(user)
+        if path.startswith(THUMBNAIL_ROOT + '/'):
+            return path.rsplit('/', 1)[0] in own
+        return path in own
+
+    if path.startswith('exports/'):
+        return ExportJob.objects.filter(file=path, requested_by=user).exists()
+
+    if path.startswith('submissions/'):
+        return has_permission(user, 'training', 'view') or Submission.objects.filter(file=path, employee=user).exists()
+
+    if path.startswith('training_materials/'):
+        return True
+
+    return False
+
+
+class _RangeFile:
+    """
+    Read-only view of `length` bytes of an open file starting at `start`.
+    """
+
+    def __init__(self, fh, start, length):
+        self.fh = fh
+        self.remaining = length
+        fh.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fh.close()
+
+
+def _parse_range(header, size):
+    """
+    Returns (start, end) inclusive for a single satisfiable byte range, None
+    to serve the whole file, or False when the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None  # absent, malformed or multi-range: send everything
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None  # invalid syntax (e.g. bytes=5-2) is ignored, RFC 9110 14.1.1
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def media_response(request, path, as_attachment=False):
+    """
+    Serves MEDIA_ROOT/`path` with conditional GET and single-range support,
+    or hands the transfer to the front proxy when MEDIA_SENDFILE_MODE is set.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    stat = os.stat(full_path)
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = ENCODED_CONTENT_TYPES.get(encoding, content_type or 'application/octet-stream')
+    disposition = content_disposition_header(True, os.path.basename(full_path)) if as_attachment else None
+
+    mode = getattr(settings, 'MEDIA_SENDFILE_MODE', None)
+    if mode:
+        response = HttpResponse(content_type=content_type)
+        if mode == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + path)
+        else:
+            response['X-Sendfile'] = full_path
+        if disposition:
+            response['Content-Disposition'] = disposition
+        return response
+
+    etag = quote_etag(f"{int(stat.st_mtime)}-{stat.st_size}")
+    last_modified = http_date(stat.st_mtime)
+    if request.headers.get('If-None-Match') == etag:
+        return HttpResponseNotModified()
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    if since and int(stat.st_mtime) <= since and 'If-None-Match' not in request.headers:
+        return HttpResponseNotModified()
+
+    byte_range = None
+    if 'Range' in request.headers:
+        if_range = request.headers.get('If-Range')
+        if not if_range or if_range in (etag, last_modified):
+            byte_range = _parse_range(request.headers['Range'], stat.st_size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+
+    fh = open(full_path, 'rb')
+    if byte_range:
+        start, end = byte_range
+        response = FileResponse(_RangeFile(fh, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    else:
+        response = FileResponse(fh, content_type=content_type)
+        response['Content-Length'] = str(stat.st_size)
+
+    if disposition:
+        response['Content-Disposition'] = disposition
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Cache-Control'] = f'private, max-age={MEDIA_CACHE_SECONDS}'
+    return response
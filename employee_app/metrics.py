@@ -0,0 +1,141 @@
+# employee_app/metrics.py
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import BiodataInvitation, BioDataRequest, CustomUser, MetricCounter
+
+# the fields each model contributes to the rollup; saves that touch none of them are skipped
+USER_METRIC_FIELDS = ('department', 'role', 'status')
+BIODATA_METRIC_FIELDS = ('status', 'created_at', 'approved_at')
+INVITATION_METRIC_FIELDS = ('submitted',)
+
+
+def user_counts(department, role, status):
+    return Counter({
+        ('users_by_department', department or ''): 1,
+        ('users_by_role', role or ''): 1,
+        ('users_by_status', status or ''): 1,
+    })
+
+
+def biodata_counts(status, created_at, approved_at):
+    counts = Counter({('biodata_by_status', status or ''): 1})
+    if status == 'approved' and approved_at and created_at:
+        counts[('approvals_timed', '')] += 1
+        counts[('approval_seconds', '')] += int((approved_at - created_at).total_seconds())
+    return counts
+
+
+def invitation_counts(submitted):
+    counts = Counter({('invitations_sent', ''): 1})
+    if submitted:
+        counts[('invitations_submitted', '')] += 1
+    return counts
+
+
+def bump(before, after):
+    """
+    Applies the difference between two per-row contributions to the
+    rollup, as F() increments so concurrent writers don't lose updates.
+    """
+    deltas = Counter(after)
+    deltas.subtract(before)
+    for (metric, dimension), delta in deltas.items():
+        if not delta:
+            continue
+        updated = MetricCounter.objects.filter(metric=metric, dimension=dimension).update(
+            value=F('value') + delta,
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    MetricCounter.objects.create(metric=metric, dimension=dimension, value=delta)
+            except IntegrityError:
+                # another writer created the row first
+                MetricCounter.objects.filter(metric=metric, dimension=dimension).update(
+                    value=F('value') + delta,
+                )
+
+
+def compute_counts():
+    """
+    Every metric recomputed from the source tables, as a Counter keyed by
+    (metric, dimension).
+    """
+    counts = Counter()
+    for field in USER_METRIC_FIELDS:
+        for value, total in CustomUser.objects.order_by().values_list(field).annotate(n=Count('pk')):
+            counts[(f'users_by_{field}', value or '')] += total
+
+    for status, total in BioDataRequest.objects.order_by().values_list('status').annotate(n=Count('pk')):
+        counts[('biodata_by_status', status)] += total
+    timed = BioDataRequest.objects.filter(status='approved', approved_at__isnull=False)
+    for created_at, approved_at in timed.values_list('created_at', 'approved_at').iterator(chunk_size=2000):
+        counts[('approvals_timed', '')] += 1
+        counts[('approval_seconds', '')] += int((approved_at - created_at).total_seconds())
+
+    invitations = BiodataInvitation.objects.order_by()
+    counts[('invitations_sent', '')] = invitations.count()
+    counts[('invitations_submitted', '')] = invitations.filter(submitted=True).count()
+    return counts
+
+
+def reconcile():
+    """
+    Rewrites the rollup from the source tables. Returns the (metric,
+    dimension) keys whose stored value had drifted.
+    """
+    with transaction.atomic():
+        expected = compute_counts()
+        stored = {
+            (row.metric, row.dimension): row
+            for row in MetricCounter.objects.select_for_update()
+        }
+        drifted = []
+        for key in set(expected) | set(stored):
+            value = expected.get(key, 0)
+            row = stored.get(key)
+            if row is None:
+                if value:
+                    MetricCounter.objects.create(metric=key[0], dimension=key[1], value=value)
+                    drifted.append(key)
+            elif row.value != value:
+                row.value = value
+                row.save(update_fields=['value', 'updated_at'])
+                drifted.append(key)
+    return sorted(drifted)
+
+
+def dashboard_metrics():
+    """
+    The HR dashboard numbers, read from the rollup in a single query.
+    """
+    values = {}
+    for metric, dimension, value in MetricCounter.objects.values_list('metric', 'dimension', 'value'):
+        values.setdefault(metric, {})[dimension] = value
+
+    def breakdown(metric, choices):
+        labels = dict(choices)
+        rows = values.get(metric, {})
+        return [(labels.get(key, key or 'Not Specified'), rows[key]) for key in rows if rows[key]]
+
+    biodata = values.get('biodata_by_status', {})
+    sent = values.get('invitations_sent', {}).get('', 0)
+    submitted = values.get('invitations_submitted', {}).get('', 0)
+    timed = values.get('approvals_timed', {}).get('', 0)
+    seconds = values.get('approval_seconds', {}).get('', 0)
+    return {
+        'headcount': sum(values.get('users_by_status', {}).values()),
+        'users_by_department': breakdown('users_by_department', CustomUser.DEPARTMENT_CHOICES),
+        'users_by_role': breakdown('users_by_role', CustomUser.ROLE_CHOICES),
+        'users_by_status': breakdown('users_by_status', CustomUser.STATUS_CHOICES),
+        'biodata_pending': biodata.get('pending', 0),
+        'biodata_approved': biodata.get('approved', 0),
+        'biodata_rejected': biodata.get('rejected', 0),
+        'invitations_sent': sent,
+        'invitations_submitted': submitted,
+        'invitation_conversion': round(submitted * 100 / sent, 1) if sent else None,
+        'avg_approval_days': round(seconds / timed / 86400, 1) if timed else None,
+    }
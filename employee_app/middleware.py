@@ -0,0 +1,33 @@
+# employee_app/middleware.py
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import UserSession
+
+LAST_SEEN_KEY = 'sessions:seen:{}'
+LAST_SEEN_INTERVAL = 5 * 60
+
+
+class UserSessionMiddleware:
+    """
+    Refreshes last_seen/expire_date on the UserSession index, at most once
+    every LAST_SEEN_INTERVAL seconds per session.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        session_key = request.session.session_key
+        if (
+            session_key
+            and request.user.is_authenticated
+            and cache.add(LAST_SEEN_KEY.format(session_key), 1, LAST_SEEN_INTERVAL)
+        ):
+            UserSession.objects.filter(session_key=session_key).update(
+                last_seen=timezone.now(),
+                expire_date=request.session.get_expiry_date(),
+            )
+        return response
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0016_exportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='kind',
+            field=models.CharField(choices=[('users', 'Users'), ('biodata', 'Approved Employees'), ('batches', 'Batches'), ('sessions', 'Sessions'), ('attendance', 'Attendance'), ('submissions', 'Submissions')], max_length=20),
+        ),
+    ]
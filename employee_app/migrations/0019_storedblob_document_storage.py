@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:06
+
+import employee_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0018_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('digest', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='aadhar_card',
+            field=models.FileField(blank=True, null=True, storage=employee_app.storage.get_document_storage, upload_to='biodata/docs/'),
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='cert_document',
+            field=models.FileField(blank=True, null=True, storage=employee_app.storage.get_document_storage, upload_to='biodata/docs/'),
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='pan_card',
+            field=models.FileField(blank=True, null=True, storage=employee_app.storage.get_document_storage, upload_to='biodata/docs/'),
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='pg_documents',
+            field=models.FileField(blank=True, null=True, storage=employee_app.storage.get_document_storage, upload_to='biodata/docs/'),
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='resume',
+            field=models.FileField(storage=employee_app.storage.get_document_storage, upload_to='biodata/resumes/'),
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='ssc_marksheet',
+            field=models.FileField(storage=employee_app.storage.get_document_storage, upload_to='biodata/docs/'),
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='sslc_marksheet',
+            field=models.FileField(storage=employee_app.storage.get_document_storage, upload_to='biodata/docs/'),
+        ),
+        migrations.AlterField(
+            model_name='biodatarequest',
+            name='ug_documents',
+            field=models.FileField(storage=employee_app.storage.get_document_storage, upload_to='biodata/docs/'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0021_customuser_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='biodatarequest',
+            index=models.Index(fields=['status', 'created_at'], name='biodata_status_created_idx'),
+        ),
+    ]
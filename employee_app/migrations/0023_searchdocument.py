@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+FTS_TABLE = 'employee_app_searchdocument_fts'
+
+SQLITE_FTS = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(body, content='employee_app_searchdocument', content_rowid='id')",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON employee_app_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON employee_app_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON employee_app_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body);
+    END""",
+]
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'mysql':
+        schema_editor.execute(
+            "ALTER TABLE employee_app_searchdocument ADD FULLTEXT INDEX searchdocument_body_ft (body)"
+        )
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FTS:
+            schema_editor.execute(sql)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'mysql':
+        schema_editor.execute("ALTER TABLE employee_app_searchdocument DROP INDEX searchdocument_body_ft")
+    elif vendor == 'sqlite':
+        for suffix in ('_ai', '_ad', '_au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def index_existing_rows(apps, schema_editor):
+    # same bodies as the models' search_text(), which historical models don't have
+    CustomUser = apps.get_model('employee_app', 'CustomUser')
+    BioDataRequest = apps.get_model('employee_app', 'BioDataRequest')
+    SearchDocument = apps.get_model('employee_app', 'SearchDocument')
+
+    def user_body(user):
+        return ' '.join(filter(None, [
+            user.full_name, user.email, user.phone,
+            user.get_department_display() if user.department else '', user.get_role_display(),
+        ]))
+
+    def biodata_body(bio):
+        return ' '.join(filter(None, [
+            bio.first_name, bio.middle_name, bio.last_name,
+            bio.personal_email, bio.official_email, bio.contact_number,
+            bio.employee_id, bio.designation, bio.department,
+            bio.technical_skills, bio.soft_skills,
+        ]))
+
+    for object_type, model, body in (('biodata', BioDataRequest, biodata_body), ('user', CustomUser, user_body)):
+        batch = []
+        for obj in model.objects.order_by('pk').iterator(chunk_size=500):
+            batch.append(SearchDocument(object_type=object_type, object_id=obj.pk, body=body(obj)))
+            if len(batch) >= 500:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0022_biodata_status_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('biodata', 'Biodata'), ('user', 'User')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('body', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('object_type', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
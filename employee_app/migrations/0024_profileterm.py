@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from employee_app.talent import profile_terms
+
+
+def index_existing_profiles(apps, schema_editor):
+    # profile_terms() only reads technical_skills and work_experience, so it
+    # works on the historical model too
+    BioDataRequest = apps.get_model('employee_app', 'BioDataRequest')
+    ProfileTerm = apps.get_model('employee_app', 'ProfileTerm')
+
+    batch = []
+    rows = BioDataRequest.objects.only('technical_skills', 'work_experience').order_by('pk')
+    for bio in rows.iterator(chunk_size=500):
+        batch += [
+            ProfileTerm(biodata_id=bio.pk, kind=kind, term=term, label=label)
+            for (kind, term), label in profile_terms(bio).items()
+        ]
+        if len(batch) >= 500:
+            ProfileTerm.objects.bulk_create(batch)
+            batch = []
+    ProfileTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0023_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('skill', 'Skill'), ('employer', 'Employer')], max_length=10)),
+                ('term', models.CharField(max_length=100)),
+                ('label', models.CharField(max_length=255)),
+                ('biodata', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_terms', to='employee_app.biodatarequest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term', 'biodata'], name='profileterm_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('biodata', 'kind', 'term'), name='unique_profile_term')],
+            },
+        ),
+        migrations.RunPython(index_existing_profiles, migrations.RunPython.noop),
+    ]
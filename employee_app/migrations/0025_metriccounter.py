@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:18
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    # same numbers as employee_app.metrics.compute_counts, from the historical models
+    CustomUser = apps.get_model('employee_app', 'CustomUser')
+    BioDataRequest = apps.get_model('employee_app', 'BioDataRequest')
+    BiodataInvitation = apps.get_model('employee_app', 'BiodataInvitation')
+    MetricCounter = apps.get_model('employee_app', 'MetricCounter')
+
+    counts = {}
+    for field in ('department', 'role', 'status'):
+        rows = CustomUser.objects.order_by().values_list(field).annotate(n=models.Count('pk'))
+        for value, total in rows:
+            key = (f'users_by_{field}', value or '')
+            counts[key] = counts.get(key, 0) + total
+    for status, total in BioDataRequest.objects.order_by().values_list('status').annotate(n=models.Count('pk')):
+        counts[('biodata_by_status', status)] = total
+    counts[('invitations_sent', '')] = BiodataInvitation.objects.count()
+    counts[('invitations_submitted', '')] = BiodataInvitation.objects.filter(submitted=True).count()
+    # approved_at is new, so no approval is timed yet
+
+    MetricCounter.objects.bulk_create([
+        MetricCounter(metric=metric, dimension=dimension, value=value)
+        for (metric, dimension), value in counts.items() if value
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0024_profileterm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biodatarequest',
+            name='approved_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='MetricCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30)),
+                ('dimension', models.CharField(blank=True, max_length=50)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'dimension'), name='unique_metric_counter')],
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:21
+
+from django.db import migrations, models
+
+
+def fill_progress(apps, schema_editor):
+    Batch = apps.get_model('employee_app', 'Batch')
+    rows = Batch.objects.order_by().annotate(
+        total=models.Count('sessions', distinct=True),
+        completed=models.Count('sessions', distinct=True, filter=models.Q(sessions__status='completed')),
+    ).filter(completed__gt=0).values_list('pk', 'total', 'completed')
+    for pk, total, completed in rows:
+        Batch.objects.filter(pk=pk).update(progress=round((completed / total) * 100, 1))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0025_metriccounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batch',
+            name='progress',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+REDACTED_BODY = '[redacted after delivery]'
+
+
+def redact_delivered(apps, schema_editor):
+    EmailOutbox = apps.get_model('employee_app', 'EmailOutbox')
+    EmailOutbox.objects.filter(status__in=['sent', 'failed']).update(body=REDACTED_BODY)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0026_batch_progress'),
+    ]
+
+    operations = [
+        migrations.RunPython(redact_delivered, migrations.RunPython.noop),
+    ]
@@ -66,12 +66,28 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        # back the users manager's keyset pagination on (date_joined, id) and its filters
+        indexes = [
+            models.Index(fields=['date_joined', 'id'], name='user_joined_idx'),
+            models.Index(fields=['role', 'date_joined', 'id'], name='user_role_joined_idx'),
+            models.Index(fields=['department', 'date_joined', 'id'], name='user_dept_joined_idx'),
+            models.Index(fields=['status', 'date_joined', 'id'], name='user_status_joined_idx'),
+        ]
+
     def __str__(self):
         return self.email
 
+    def search_text(self):
+        return ' '.join(filter(None, [
+            self.full_name, self.email, self.phone,
+            self.get_department_display() if self.department else '', self.get_role_display(),
+        ]))
+
 
 from django.db import models
 from django.contrib.auth import get_user_model
+from .storage import get_document_storage
 
 User = get_user_model()
 
@@ -166,35 +182,35 @@ class BioDataRequest(models.Model):
 
     # Files
     photo = models.ImageField(upload_to='biodata/photos/')
-    resume = models.FileField(upload_to='biodata/resumes/')
-    aadhar_card = models.FileField(upload_to='biodata/docs/', null=True, blank=True)
-    pan_card = models.FileField(upload_to='biodata/docs/', null=True, blank=True)
+    resume = models.FileField(upload_to='biodata/resumes/', storage=get_document_storage)
+    aadhar_card = models.FileField(upload_to='biodata/docs/', storage=get_document_storage, null=True, blank=True)
+    pan_card = models.FileField(upload_to='biodata/docs/', storage=get_document_storage, null=True, blank=True)
 
     # Education
     ssc_school = models.CharField(max_length=255)
     ssc_year = models.PositiveIntegerField()
     ssc_grade = models.CharField(max_length=20)
-    ssc_marksheet = models.FileField(upload_to='biodata/docs/')
+    ssc_marksheet = models.FileField(upload_to='biodata/docs/', storage=get_document_storage)
 
     sslc_school = models.CharField(max_length=255)
     sslc_year = models.PositiveIntegerField()
     sslc_grade = models.CharField(max_length=20)
-    sslc_marksheet = models.FileField(upload_to='biodata/docs/')
+    sslc_marksheet = models.FileField(upload_to='biodata/docs/', storage=get_document_storage)
 
     ug_degree = models.CharField(max_length=255)
     ug_institution = models.CharField(max_length=255)
     ug_year = models.PositiveIntegerField()
-    ug_documents = models.FileField(upload_to='biodata/docs/')
+    ug_documents = models.FileField(upload_to='biodata/docs/', storage=get_document_storage)
 
     pg_degree = models.CharField(max_length=255, blank=True)
     pg_institution = models.CharField(max_length=255, blank=True)
     pg_year = models.PositiveIntegerField(null=True, blank=True)
-    pg_documents = models.FileField(upload_to='biodata/docs/', null=True, blank=True)
+    pg_documents = models.FileField(upload_to='biodata/docs/', storage=get_document_storage, null=True, blank=True)
 
     cert_course = models.CharField(max_length=255, blank=True)
     cert_institution = models.CharField(max_length=255, blank=True)
     cert_year = models.PositiveIntegerField(null=True, blank=True)
-    cert_document = models.FileField(upload_to='biodata/docs/', null=True, blank=True)
+    cert_document = models.FileField(upload_to='biodata/docs/', storage=get_document_storage, null=True, blank=True)
 
     # Work Experience (dynamic + certificate)
     work_experience = models.JSONField(default=list, blank=True)  # stores list of dicts from prev_employer[], etc.
@@ -215,6 +231,7 @@ class BioDataRequest(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     reject_reason = models.TextField(blank=True)
     approved_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    approved_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -223,9 +240,39 @@ class BioDataRequest(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # review queue / history tabs: filter on status, keyset on created_at
+            models.Index(fields=['status', 'created_at'], name='biodata_status_created_idx'),
+        ]
 
     def get_status_class(self):
         return {'pending': 'pending', 'approved': 'completed', 'rejected': 'danger'}[self.status]
+
+    DOCUMENT_FIELDS = (
+        'resume', 'aadhar_card', 'pan_card', 'ssc_marksheet', 'sslc_marksheet',
+        'ug_documents', 'pg_documents', 'cert_document',
+    )
+
+    def search_text(self):
+        return ' '.join(filter(None, [
+            self.first_name, self.middle_name, self.last_name,
+            self.personal_email, self.official_email, self.contact_number,
+            self.employee_id, self.designation, self.department,
+            self.technical_skills, self.soft_skills,
+        ]))
+
+    def document_names(self):
+        """
+        Storage names of every uploaded document, including work-experience certificates.
+        """
+        names = [getattr(self, f).name for f in self.DOCUMENT_FIELDS if getattr(self, f)]
+        return names + self.certificate_names()
+
+    def certificate_names(self):
+        """
+        Storage names of the work-experience certificates.
+        """
+        return [exp['certificate_name'] for exp in self.work_experience or [] if exp.get('certificate_name')]
     
 
 class BiodataInvitation(models.Model):
@@ -273,9 +320,61 @@ class Notification(models.Model):
         return f"{self.title} → {self.recipient.email if self.recipient else 'Deleted'}"
     
 
-from django.db.models.signals import post_save
+class UserSession(models.Model):
+    """
+    Index of a user's logged-in sessions, so the settings page and
+    "sign out everywhere" don't have to decode every django_session row.
+    """
+    user = models.ForeignKey(
+        'CustomUser',
+        on_delete=models.CASCADE,
+        related_name='user_sessions'
+    )
+    session_key = models.CharField(max_length=40, unique=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now_add=True)
+    expire_date = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-last_seen']
+        indexes = [
+            models.Index(fields=['user', 'expire_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.email} - {self.session_key[:8]}"
+
+
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.dispatch import receiver
 
+
+@receiver(user_logged_in)
+def track_user_session(sender, request, user, **kwargs):
+    if not request.session.session_key:
+        request.session.save()
+    UserSession.objects.update_or_create(
+        session_key=request.session.session_key,
+        defaults={
+            'user': user,
+            'ip_address': request.META.get('REMOTE_ADDR') or None,
+            'user_agent': request.META.get('HTTP_USER_AGENT', '')[:255],
+            'expire_date': request.session.get_expiry_date(),
+        }
+    )
+
+
+@receiver(user_logged_out)
+def untrack_user_session(sender, request, user, **kwargs):
+    if request.session.session_key:
+        UserSession.objects.filter(session_key=request.session.session_key).delete()
+
+
 # Flag to prevent infinite recursion
 _syncing = False
 
@@ -310,6 +409,192 @@ def sync_biodata_to_user(sender, instance, **kwargs):
             _syncing = False
 
 
+from .thumbnails import delete_thumbnails, generate_eager_thumbnails, thumbnail_name
+
+@receiver(post_save, sender=BioDataRequest)
+def build_photo_thumbnails(sender, instance, update_fields=None, **kwargs):
+    if not instance.photo or (update_fields is not None and 'photo' not in update_fields):
+        return
+    name = instance.photo.name
+    if default_storage.exists(thumbnail_name(name, 'avatar', 'webp')):
+        return
+    transaction.on_commit(lambda: generate_eager_thumbnails(name))
+
+
+@receiver(post_delete, sender=BioDataRequest)
+def remove_photo_thumbnails(sender, instance, **kwargs):
+    if instance.photo:
+        delete_thumbnails(instance.photo.name)
+
+
+@receiver(post_delete, sender=BioDataRequest)
+def release_biodata_documents(sender, instance, **kwargs):
+    get_document_storage().release(instance.document_names())
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalised search text for one biodata request or user, kept in sync
+    by the post_save/post_delete receivers below. The body carries a MySQL
+    FULLTEXT index, or an FTS5 shadow table on SQLite (see migration 0023);
+    queries go through employee_app.search.
+    """
+    TYPE_CHOICES = (
+        ('biodata', 'Biodata'),
+        ('user', 'User'),
+    )
+
+    object_type = models.CharField(max_length=10, choices=TYPE_CHOICES)
+    object_id = models.PositiveIntegerField()
+    body = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['object_type', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.object_type}:{self.object_id}"
+
+
+def _index_document(object_type, object_id, body):
+    SearchDocument.objects.update_or_create(
+        object_type=object_type, object_id=object_id, defaults={'body': body},
+    )
+
+
+# saves limited to other fields (e.g. last_login on every sign-in) don't touch the index
+BIODATA_SEARCH_FIELDS = {
+    'first_name', 'middle_name', 'last_name', 'personal_email', 'official_email', 'contact_number',
+    'employee_id', 'designation', 'department', 'technical_skills', 'soft_skills',
+}
+USER_SEARCH_FIELDS = {'full_name', 'email', 'phone', 'department', 'role'}
+
+
+@receiver(post_save, sender=BioDataRequest)
+def index_biodata(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or BIODATA_SEARCH_FIELDS & set(update_fields):
+        _index_document('biodata', instance.pk, instance.search_text())
+
+
+@receiver(post_save, sender=CustomUser)
+def index_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or USER_SEARCH_FIELDS & set(update_fields):
+        _index_document('user', instance.pk, instance.search_text())
+
+
+@receiver(post_delete, sender=BioDataRequest)
+def unindex_biodata(sender, instance, **kwargs):
+    SearchDocument.objects.filter(object_type='biodata', object_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=CustomUser)
+def unindex_user(sender, instance, **kwargs):
+    SearchDocument.objects.filter(object_type='user', object_id=instance.pk).delete()
+
+
+class ProfileTerm(models.Model):
+    """
+    One normalised technical skill or previous employer of a biodata request,
+    derived from technical_skills and work_experience. Kept in sync by the
+    receiver below; queried through employee_app.talent.find_talent.
+    """
+    KIND_CHOICES = (
+        ('skill', 'Skill'),
+        ('employer', 'Employer'),
+    )
+
+    biodata = models.ForeignKey(BioDataRequest, on_delete=models.CASCADE, related_name='profile_terms')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    term = models.CharField(max_length=100)
+    label = models.CharField(max_length=255)  # as the employee wrote it
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['biodata', 'kind', 'term'], name='unique_profile_term'),
+        ]
+        indexes = [
+            # term -> biodata lookups; covers the grouped counts in find_talent
+            models.Index(fields=['kind', 'term', 'biodata'], name='profileterm_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.term}"
+
+
+PROFILE_TERM_FIELDS = {'technical_skills', 'work_experience'}
+
+
+@receiver(post_save, sender=BioDataRequest)
+def index_profile_terms(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or PROFILE_TERM_FIELDS & set(update_fields):
+        from .talent import index_profile
+        index_profile(instance)
+
+
+class MetricCounter(models.Model):
+    """
+    One number of the HR dashboard rollup, e.g. ('users_by_role', 'trainer').
+    Maintained incrementally by the receivers below and rewritten nightly by
+    `manage.py reconcile_metrics`; see employee_app.metrics.
+    """
+    metric = models.CharField(max_length=30)
+    dimension = models.CharField(max_length=50, blank=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'dimension'], name='unique_metric_counter'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.dimension}] = {self.value}"
+
+
+def _metric_source(sender):
+    from . import metrics
+    return {
+        CustomUser: (metrics.USER_METRIC_FIELDS, metrics.user_counts),
+        BioDataRequest: (metrics.BIODATA_METRIC_FIELDS, metrics.biodata_counts),
+        BiodataInvitation: (metrics.INVITATION_METRIC_FIELDS, metrics.invitation_counts),
+    }[sender]
+
+
+@receiver(pre_save, sender=CustomUser)
+@receiver(pre_save, sender=BioDataRequest)
+@receiver(pre_save, sender=BiodataInvitation)
+def capture_metric_state(sender, instance, update_fields=None, **kwargs):
+    fields, counts = _metric_source(sender)
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    before = None
+    if not instance._state.adding:
+        before = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    instance._metric_before = counts(*before) if before else {}
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=BioDataRequest)
+@receiver(post_save, sender=BiodataInvitation)
+def update_metrics(sender, instance, **kwargs):
+    if not hasattr(instance, '_metric_before'):
+        return
+    from .metrics import bump
+    fields, counts = _metric_source(sender)
+    bump(instance.__dict__.pop('_metric_before'), counts(*(getattr(instance, f) for f in fields)))
+
+
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=BioDataRequest)
+@receiver(post_delete, sender=BiodataInvitation)
+def retract_metrics(sender, instance, **kwargs):
+    from .metrics import bump
+    fields, counts = _metric_source(sender)
+    bump(counts(*(getattr(instance, f) for f in fields)), {})
+
+
 
 
 # employee_app/models.py (add these at the end)
@@ -323,6 +608,31 @@ from django.contrib.contenttypes.models import ContentType
 
 User = get_user_model()
 
+
+class BatchQuerySet(models.QuerySet):
+    def with_progress(self):
+        """
+        Annotates session_total and sessions_completed with one conditional
+        aggregate, so progress_percentage needs no further queries.
+        """
+        return self.annotate(
+            session_total=models.Count('sessions', distinct=True),
+            sessions_completed=models.Count(
+                'sessions', distinct=True, filter=models.Q(sessions__status='completed'),
+            ),
+        )
+
+    def refresh_progress(self):
+        """
+        Recomputes the cached progress column for these batches.
+        """
+        rows = self.order_by().with_progress().values_list('pk', 'progress', 'session_total', 'sessions_completed')
+        for pk, current, total, completed in rows:
+            progress = Batch.percentage(completed, total)
+            if progress != current:
+                Batch.objects.filter(pk=pk).update(progress=progress)
+
+
 class Batch(models.Model):
     name = models.CharField(max_length=200, unique=True)
     batch_code = models.CharField(max_length=50, unique=True, blank=True)  # e.g. PYFS-2026-A
@@ -348,17 +658,24 @@ class Batch(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # share of completed sessions, kept current by the Session receivers below
+    progress = models.FloatField(default=0, editable=False)
+
+    objects = BatchQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def percentage(completed, total):
+        return round((completed / total) * 100, 1) if total else 0
+
     @property
     def progress_percentage(self):
-        total = self.sessions.count()
-        if total == 0:
-            return 0
-        completed = self.sessions.filter(status='completed').count()
-        return round((completed / total) * 100, 1)
+        # counts from with_progress() when annotated, else the cached column
+        if hasattr(self, 'session_total'):
+            return self.percentage(self.sessions_completed, self.session_total)
+        return self.progress
 
     def save(self, *args, **kwargs):
         if not self.batch_code:
@@ -413,6 +730,32 @@ class Session(models.Model):
         return round((present / total) * 100, 1)
 
 
+@receiver(pre_save, sender=Session)
+def capture_session_progress_state(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'status', 'batch'} & set(update_fields):
+        return
+    before = None
+    if not instance._state.adding:
+        before = Session.objects.filter(pk=instance.pk).values_list('batch_id', 'status').first()
+    instance._progress_before = before
+
+
+@receiver(post_save, sender=Session)
+def update_batch_progress(sender, instance, **kwargs):
+    if not hasattr(instance, '_progress_before'):
+        return
+    before = instance.__dict__.pop('_progress_before')
+    if before == (instance.batch_id, instance.status):
+        return
+    batch_ids = {instance.batch_id} | ({before[0]} if before else set())
+    Batch.objects.filter(pk__in=batch_ids).refresh_progress()
+
+
+@receiver(post_delete, sender=Session)
+def release_batch_progress(sender, instance, **kwargs):
+    Batch.objects.filter(pk=instance.batch_id).refresh_progress()
+
+
 class Assignment(models.Model):
     title = models.CharField(max_length=200)
     batch = models.ForeignKey(Batch, on_delete=models.CASCADE, related_name='assignments')
@@ -507,4 +850,128 @@ class Material(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["content_type", "object_id"]),
-        ]
\ No newline at end of file
+        ]
+
+import uuid
+
+
+def export_upload_to(instance, filename):
+    # Random directory so finished exports can't be guessed from MEDIA_URL
+    return f"exports/{uuid.uuid4().hex}/{filename}"
+
+
+class ExportJob(models.Model):
+    KIND_CHOICES = (
+        ('users', 'Users'),
+        ('biodata', 'Approved Employees'),
+        ('batches', 'Batches'),
+        ('sessions', 'Sessions'),
+        ('attendance', 'Attendance'),
+        ('submissions', 'Submissions'),
+    )
+
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)  # e.g. {'search': ..., 'department': ...}
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    rows_processed = models.PositiveIntegerField(default=0)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    elapsed_seconds = models.FloatField(null=True, blank=True)
+    file = models.FileField(upload_to=export_upload_to, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} export #{self.pk} ({self.status})"
+
+
+class StoredBlob(models.Model):
+    """
+    One row per distinct document stored by ContentAddressedStorage,
+    counting the records that reference it.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+
+
+class ChunkedUpload(models.Model):
+    """
+    A file being sent to the public biodata form in chunks. The bytes
+    accumulate in CHUNKED_UPLOAD_DIR until the form submit claims the upload
+    (the row is deleted then).
+    """
+    STATUS_CHOICES = (
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    field_name = models.CharField(max_length=50)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.PositiveIntegerField()
+    received = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing mail queued in the same transaction as the change that caused
+    it; `manage.py send_outbox` delivers it over a shared SMTP connection.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
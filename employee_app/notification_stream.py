@@ -0,0 +1,57 @@
+# employee_app/notification_stream.py
+import asyncio
+import threading
+
+
+class NotificationBroker:
+    """
+    In-process pub/sub used by the SSE notification stream.
+    Each connected browser tab owns an asyncio.Queue; publishers may run in
+    any thread (sync views, on_commit hooks), so delivery is handed to the
+    subscriber's event loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, max_pending=100):
+        self.max_pending = max_pending
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(entry)
+        return entry
+
+    def unsubscribe(self, user_id, entry):
+        with self._lock:
+            entries = self._subscribers.get(user_id)
+            if entries:
+                entries.discard(entry)
+                if not entries:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_ids, payload):
+        with self._lock:
+            targets = [
+                entry
+                for user_id in user_ids
+                for entry in self._subscribers.get(user_id, ())
+            ]
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, payload)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                pass
+
+    @staticmethod
+    def _deliver(queue, payload):
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Slow client; it will resync through the poll endpoint
+            pass
+
+
+broker = NotificationBroker()
@@ -0,0 +1,146 @@
+# employee_app/search.py
+import re
+
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from .models import BioDataRequest, CustomUser, SearchDocument
+
+FTS_TABLE = 'employee_app_searchdocument_fts'
+MYSQL_MIN_TOKEN = 3  # innodb_ft_min_token_size default; shorter terms are never indexed
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+# INNODB_FT_DEFAULT_STOPWORD; a required stopword makes a boolean MATCH return nothing
+MYSQL_STOPWORDS = frozenset((
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from', 'how',
+    'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what',
+    'when', 'where', 'who', 'will', 'with', 'und', 'www',
+))
+
+
+def _tokens(query):
+    return TOKEN_RE.findall(query.lower())[:10]
+
+
+def _mysql_indexed(token):
+    return len(token) >= MYSQL_MIN_TOKEN and token not in MYSQL_STOPWORDS
+
+
+def _mysql_terms(tokens):
+    return ' '.join(f'+{t}*' for t in tokens if _mysql_indexed(t))
+
+
+def _sqlite_terms(tokens):
+    return ' AND '.join(f'"{t}"*' for t in tokens)
+
+
+_has_fts_table = None
+
+
+def _sqlite_has_fts():
+    global _has_fts_table
+    if _has_fts_table is None:
+        _has_fts_table = FTS_TABLE in connection.introspection.table_names()
+    return _has_fts_table
+
+
+def _backend():
+    if connection.vendor == 'mysql':
+        return 'mysql'
+    if connection.vendor == 'sqlite' and _sqlite_has_fts():
+        return 'sqlite'
+    return None
+
+
+def matching_documents(object_type, tokens):
+    """
+    Every `object_type` document containing all of `tokens` (as prefixes).
+    Not limited or ordered; use as a subquery.
+    """
+    docs = SearchDocument.objects.filter(object_type=object_type)
+    backend = _backend()
+    if backend == 'mysql':
+        terms = _mysql_terms(tokens)
+        if terms:
+            docs = docs.alias(
+                ft=RawSQL('MATCH(body) AGAINST (%s IN BOOLEAN MODE)', [terms], output_field=FloatField()),
+            ).filter(ft__gt=0)
+        # the FULLTEXT index drops short tokens and stopwords, so match those with LIKE
+        for token in tokens:
+            if not _mysql_indexed(token):
+                docs = docs.filter(body__icontains=token)
+    elif backend == 'sqlite':
+        docs = docs.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [_sqlite_terms(tokens)],
+        ))
+    else:
+        # No full-text index on this backend: substring match
+        for token in tokens:
+            docs = docs.filter(body__icontains=token)
+    return docs
+
+
+def _relevance(model, object_type, tokens):
+    """
+    Ordering expression that puts the best match first, or None when the
+    backend can't rank. Correlated on the outer model's primary key.
+    """
+    outer = f'{connection.ops.quote_name(model._meta.db_table)}.{connection.ops.quote_name(model._meta.pk.column)}'
+    backend = _backend()
+    if backend == 'mysql':
+        terms = _mysql_terms(tokens)
+        if not terms:
+            return None
+        score = RawSQL(
+            'SELECT MATCH(d.body) AGAINST (%s IN BOOLEAN MODE) FROM employee_app_searchdocument d '
+            f'WHERE d.object_type = %s AND d.object_id = {outer}',
+            [terms, object_type], output_field=FloatField(),
+        )
+        return score.desc()
+    if backend == 'sqlite':
+        # bm25() is lower for better matches
+        score = RawSQL(
+            f'SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+            f'JOIN employee_app_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.object_type = %s AND d.object_id = {outer}',
+            [_sqlite_terms(tokens), object_type], output_field=FloatField(),
+        )
+        return score.asc()
+    return None
+
+
+def apply_search(queryset, object_type, query, rank=True):
+    """
+    Narrows `queryset` to every search match. With `rank`, results are
+    ordered by relevance (the queryset's own ordering breaks ties);
+    otherwise the queryset keeps its ordering.
+    """
+    tokens = _tokens(query or '')
+    if not tokens:
+        return queryset
+    docs = matching_documents(object_type, tokens)
+    queryset = queryset.filter(pk__in=docs.values('object_id'))
+    if rank:
+        relevance = _relevance(queryset.model, object_type, tokens)
+        if relevance is not None:
+            queryset = queryset.order_by(relevance, *queryset.query.order_by)
+    return queryset
+
+
+def rebuild_index(batch_size=500):
+    """
+    Recreates every search document from the source tables. Returns the
+    number of documents written.
+    """
+    written = 0
+    for object_type, model in (('biodata', BioDataRequest), ('user', CustomUser)):
+        SearchDocument.objects.filter(object_type=object_type).delete()
+        batch = []
+        for obj in model.objects.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(SearchDocument(object_type=object_type, object_id=obj.pk, body=obj.search_text()))
+            if len(batch) >= batch_size:
+                written += len(SearchDocument.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            written += len(SearchDocument.objects.bulk_create(batch))
+    return written
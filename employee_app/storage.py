@@ -0,0 +1,111 @@
+# employee_app/storage.py
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import LazyObject
+
+DOCUMENT_ROOT = 'documents'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each upload once, under the SHA-256 of its content, inside
+    MEDIA_ROOT. Saving identical bytes twice returns the same name and bumps
+    the StoredBlob refcount instead of writing a second copy; release()
+    drops a reference and removes the file once nothing points at it.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # the final name comes from the digest, so the upload name never collides
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()[:10]
+        directory = self.path(DOCUMENT_ROOT)
+        os.makedirs(directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    tmp.write(chunk)
+
+            hexdigest = digest.hexdigest()
+            final_name = f"{DOCUMENT_ROOT}/{hexdigest[:2]}/{hexdigest[2:4]}/{hexdigest}{ext}"
+            final_path = self.path(final_name)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._add_reference(final_name, hexdigest, size)
+        return final_name
+
+    def _add_reference(self, name, digest, size):
+        StoredBlob = apps.get_model('employee_app', 'StoredBlob')
+        blob, created = StoredBlob.objects.get_or_create(
+            name=name, defaults={'digest': digest, 'size': size, 'refcount': 1},
+        )
+        if not created:
+            StoredBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') + 1)
+
+    def release(self, names):
+        """
+        Drops one reference per name. Files whose count reaches zero are
+        deleted once the surrounding transaction commits.
+        """
+        StoredBlob = apps.get_model('employee_app', 'StoredBlob')
+        names = [n for n in names if n and n.startswith(DOCUMENT_ROOT + '/')]
+        if not names:
+            return
+
+        with transaction.atomic():
+            for name in names:
+                StoredBlob.objects.filter(name=name, refcount__gt=0).update(refcount=F('refcount') - 1)
+            orphans = list(
+                StoredBlob.objects.select_for_update()
+                .filter(name__in=names, refcount=0)
+                .values_list('name', flat=True)
+            )
+            StoredBlob.objects.filter(name__in=orphans, refcount=0).delete()
+
+        if orphans:
+            transaction.on_commit(lambda: self.remove_unreferenced(orphans))
+
+    def remove_unreferenced(self, names):
+        StoredBlob = apps.get_model('employee_app', 'StoredBlob')
+        # a concurrent upload of the same bytes may have re-registered the blob
+        revived = set(StoredBlob.objects.filter(name__in=names).values_list('name', flat=True))
+        for name in names:
+            if name not in revived and self.exists(name):
+                self.delete(name)
+
+
+class DocumentStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage()
+
+
+document_storage = DocumentStorage()
+
+
+def get_document_storage():
+    return document_storage
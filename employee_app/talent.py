@@ -0,0 +1,135 @@
+# employee_app/talent.py
+import re
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import BioDataRequest, ProfileTerm
+
+SKILL_SEPARATORS = re.compile(r'[,;/|\n\r•]+|\band\b|&', re.IGNORECASE)
+EMPLOYER_SUFFIXES = re.compile(
+    r'\b(pvt|private|ltd|limited|llp|llc|inc|corp|corporation|co|company|technologies|solutions)\b\.?'
+)
+
+# common spellings folded onto one term, so "ReactJS" and "React.js" both match "react"
+SKILL_ALIASES = {
+    'reactjs': 'react', 'react.js': 'react',
+    'nodejs': 'node', 'node.js': 'node',
+    'vuejs': 'vue', 'vue.js': 'vue',
+    'angularjs': 'angular',
+    'js': 'javascript', 'ts': 'typescript',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'c sharp': 'c#',
+    'drf': 'django rest framework',
+}
+
+
+def normalize_skill(text):
+    term = ' '.join(text.lower().replace('(', ' ').replace(')', ' ').split()).strip(' .-')
+    return SKILL_ALIASES.get(term, term)[:100]
+
+
+def normalize_employer(text):
+    term = EMPLOYER_SUFFIXES.sub(' ', text.lower().replace('.', ' '))
+    return ' '.join(re.sub(r'[^\w&+]+', ' ', term).split())[:100]
+
+
+def split_skills(text):
+    return [s for s in SKILL_SEPARATORS.split(text or '') if s.strip()]
+
+
+def profile_terms(bio):
+    """
+    {(kind, term): label} for one biodata request: each listed technical
+    skill, and each previous employer from work_experience.
+    """
+    terms = {}
+    for raw in split_skills(bio.technical_skills):
+        term = normalize_skill(raw)
+        if term:
+            terms.setdefault(('skill', term), raw.strip()[:255])
+    for exp in bio.work_experience or []:
+        raw = (exp.get('employer') or '') if isinstance(exp, dict) else ''
+        term = normalize_employer(raw)
+        if term:
+            terms.setdefault(('employer', term), raw.strip()[:255])
+    return terms
+
+
+def index_profile(bio):
+    """
+    Brings the terms stored for `bio` in line with its current fields,
+    touching only the rows that changed.
+    """
+    wanted = profile_terms(bio)
+    existing = {(kind, term): pk for pk, kind, term in
+                ProfileTerm.objects.filter(biodata=bio).values_list('pk', 'kind', 'term')}
+    stale = [pk for key, pk in existing.items() if key not in wanted]
+    if stale:
+        ProfileTerm.objects.filter(pk__in=stale).delete()
+    ProfileTerm.objects.bulk_create([
+        ProfileTerm(biodata=bio, kind=kind, term=term, label=label)
+        for (kind, term), label in wanted.items() if (kind, term) not in existing
+    ])
+
+
+def find_talent(skills=(), employers=(), min_employers=0, queryset=None):
+    """
+    Biodata requests with every one of `skills`, at least one of `employers`
+    (if given) and `min_employers` or more distinct previous employers.
+    Skills and employers are normalised the same way as the index, so
+    "ReactJS" finds "React.js".
+    """
+    skills = {normalize_skill(s) for s in skills} - {''}
+    employers = {normalize_employer(e) for e in employers} - {''}
+    queryset = BioDataRequest.objects.all() if queryset is None else queryset
+
+    # narrow step by step, each step grouping only the previous candidates' rows
+    candidates = None
+    if skills:
+        candidates = (
+            ProfileTerm.objects.filter(kind='skill', term__in=skills)
+            .values('biodata_id').annotate(hits=Count('pk')).filter(hits=len(skills))
+            .values('biodata_id')
+        )
+    if employers:
+        rows = ProfileTerm.objects.filter(kind='employer', term__in=employers)
+        if candidates is not None:
+            rows = rows.filter(biodata_id__in=candidates)
+        candidates = rows.values('biodata_id').distinct()
+    if min_employers > 0:
+        rows = ProfileTerm.objects.filter(kind='employer')
+        if candidates is not None:
+            rows = rows.filter(biodata_id__in=candidates)
+        candidates = (
+            rows.values('biodata_id').annotate(employer_count=Count('pk'))
+            .filter(employer_count__gte=min_employers).values('biodata_id')
+        )
+    if candidates is None:
+        return queryset
+    return queryset.filter(pk__in=candidates)
+
+
+def rebuild_talent_index(batch_size=500):
+    """
+    Recreates every profile term from the source rows. Returns the number
+    of terms written.
+    """
+    written = 0
+    with transaction.atomic():
+        ProfileTerm.objects.all().delete()
+        batch = []
+        rows = BioDataRequest.objects.only('technical_skills', 'work_experience').order_by('pk')
+        for bio in rows.iterator(chunk_size=batch_size):
+            batch += [
+                ProfileTerm(biodata_id=bio.pk, kind=kind, term=term, label=label)
+                for (kind, term), label in profile_terms(bio).items()
+            ]
+            if len(batch) >= batch_size:
+                written += len(ProfileTerm.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            written += len(ProfileTerm.objects.bulk_create(batch))
+    return written
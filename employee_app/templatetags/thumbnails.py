@@ -0,0 +1,33 @@
+from django import template
+from django.utils.html import format_html
+
+from ..thumbnails import thumbnail_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail(source, size='avatar', fmt='webp'):
+    """
+    URL of a thumbnail, generated when the image is first requested.
+    Usage: {% thumbnail bio.photo 'avatar' %} or {% thumbnail bio.photo 'medium' 'jpeg' %}
+    """
+    return thumbnail_url(source, size, fmt)
+
+
+@register.simple_tag
+def thumbnail_picture(source, size='avatar', alt='', css_class=''):
+    """
+    <picture> with a WebP source and a JPEG fallback, lazily loaded.
+    Usage: {% thumbnail_picture bio.photo 'avatar' alt=bio.first_name css_class='user-avatar' %}
+    """
+    if not getattr(source, 'name', source):
+        return ''
+    return format_html(
+        '<picture><source srcset="{}" type="image/webp">'
+        '<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async"></picture>',
+        thumbnail_url(source, size, 'webp'),
+        thumbnail_url(source, size, 'jpeg'),
+        alt,
+        css_class,
+    )
@@ -1,3 +1,675 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django import forms
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection, transaction
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import export_jobs, invitations, mailer, metrics, search, talent, thumbnails, uploads
+from .media import media_response
+from .forms import BioDataEditForm
+from .models import (
+    Assignment, Batch, BiodataInvitation, BioDataRequest, CustomUser, EmailOutbox, ExportJob, MetricCounter,
+    Notification, Session, StoredBlob,
+)
+from .utils import create_notification, get_unread_count
+from .storage import document_storage
+from .views import _training_stats
+
+
+def use_temp_media_root(testcase, **settings):
+    """
+    Points MEDIA_ROOT (and the document storage) at a directory removed
+    after the test.
+    """
+    media_root = tempfile.mkdtemp()
+    testcase.addCleanup(shutil.rmtree, media_root)
+    settings_override = override_settings(MEDIA_ROOT=media_root, **settings)
+    settings_override.enable()
+    testcase.addCleanup(settings_override.disable)
+    document_storage._setup()
+    testcase.addCleanup(document_storage._setup)
+    return media_root
+
+
+
+class TrainingDashboardQueryTests(TestCase):
+    # user, three paginator counts, the stats SELECT, then batches, trainers, sessions, assignments
+    DASHBOARD_QUERIES = 9
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user('admin@example.com', 'pw', role='super_admin')
+        cls.trainer = CustomUser.objects.create_user('trainer@example.com', 'pw', role='trainer')
+        cls.employees = [
+            CustomUser.objects.create_user(f'employee{i}@example.com', 'pw', role='employee')
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        self.batch_count = 0
+
+    def add_batches(self, count):
+        for _ in range(count):
+            i = self.batch_count
+            self.batch_count += 1
+            batch = Batch.objects.create(
+                name=f'Batch {i}',
+                start_date=date(2026, 1, 1) + timedelta(days=i),
+                end_date=date(2026, 6, 1),
+                status='ongoing' if i % 2 else 'pending',
+            )
+            batch.trainers.add(self.trainer)
+            batch.employees.add(*self.employees[:i % 5 + 1])
+            session = Session.objects.create(
+                title=f'Session {i}', batch=batch, trainer=self.trainer, date_time=timezone.now(),
+            )
+            Assignment.objects.create(
+                title=f'Assignment {i}', batch=batch, session=session,
+                due_date=date(2026, 3, 1), max_score=10,
+            )
+
+    def dashboard_queries(self):
+        url = reverse('employee_app:training_dashboard')
+        self.client.get(url)  # warm up per-session bookkeeping (last_seen, notification header)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_independent_of_batch_count(self):
+        self.add_batches(3)
+        few = self.dashboard_queries()
+        self.add_batches(40)
+        many = self.dashboard_queries()
+        self.assertEqual(few, many)
+
+    def test_full_page_query_count(self):
+        self.add_batches(40)
+        url = reverse('employee_app:training_dashboard')
+        self.client.get(url)
+        with self.assertNumQueries(self.DASHBOARD_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['batches']), 10)
+        self.assertContains(response, 'trainer@example.com')
+
+    def test_training_stats_in_one_query(self):
+        self.add_batches(4)
+        with self.assertNumQueries(1):
+            stats = _training_stats(self.admin)
+        self.assertEqual(stats, {
+            'active_batches_count': 2,
+            'total_sessions': 4,
+            'pending_assignments': 4,
+            'enrolled_employees': 4,
+        })
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionResetError('connection reset by peer')
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_OUTBOX_RUNNER='worker')
+class OutboxTests(TestCase):
+    def queue(self, body='Temporary Password: s3cret'):
+        return mailer.queue_email('Welcome', body, ['new@example.com'], from_email='hr@example.com')
+
+    def test_queue_stores_without_sending(self):
+        email = self.queue()
+        self.assertEqual(len(mail.outbox), 0)
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.to, ['new@example.com'])
+
+    def test_thread_runner_delivers_only_on_commit(self):
+        with override_settings(EMAIL_OUTBOX_RUNNER='thread'), \
+                mock.patch.object(mailer, '_deliver_in_background') as deliver:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    self.queue()
+                    deliver.assert_not_called()
+            self.assertEqual(len(callbacks), 1)
+            deliver.assert_called_once_with()
+
+    def test_rolled_back_mail_is_never_queued(self):
+        with override_settings(EMAIL_OUTBOX_RUNNER='thread'), \
+                mock.patch.object(mailer, '_deliver_in_background') as deliver:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                try:
+                    with transaction.atomic():
+                        self.queue()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+            self.assertEqual(callbacks, [])
+            deliver.assert_not_called()
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    def test_delivery_marks_sent_and_redacts_body(self):
+        email = self.queue()
+        self.assertEqual(mailer.deliver_outbox(), (1, 0))
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].body, 'Temporary Password: s3cret')
+        self.assertEqual(mail.outbox[0].to, ['new@example.com'])
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'sent')
+        self.assertEqual(email.attempts, 1)
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(email.body, mailer.REDACTED_BODY)
+        self.assertEqual(mailer.deliver_outbox(), (0, 0))
+
+    @override_settings(EMAIL_BACKEND='employee_app.tests.FailingBackend')
+    def test_failures_back_off_then_give_up(self):
+        email = self.queue()
+        for attempt in range(1, mailer.MAX_ATTEMPTS + 1):
+            before = timezone.now()
+            self.assertEqual(mailer.deliver_outbox(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, attempt)
+            self.assertIn('connection reset', email.last_error)
+            if attempt < mailer.MAX_ATTEMPTS:
+                self.assertEqual(email.status, 'pending')
+                self.assertEqual(email.body, 'Temporary Password: s3cret')
+                self.assertGreaterEqual(email.next_attempt_at, before + mailer.backoff(attempt))
+                # not due yet
+                self.assertEqual(mailer.deliver_outbox(), (0, 0))
+                EmailOutbox.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(email.body, mailer.REDACTED_BODY)
+
+    def test_backoff_grows_and_is_capped(self):
+        self.assertEqual(mailer.backoff(1), timedelta(seconds=30))
+        self.assertEqual(mailer.backoff(3), timedelta(seconds=120))
+        self.assertEqual(mailer.backoff(20), timedelta(seconds=mailer.MAX_BACKOFF_SECONDS))
+
+    def test_purge_removes_old_delivered_mail_only(self):
+        old_sent, old_pending, recent_sent = self.queue(), self.queue(), self.queue()
+        EmailOutbox.objects.filter(pk__in=[old_sent.pk, recent_sent.pk]).update(status='sent')
+        EmailOutbox.objects.filter(pk__in=[old_sent.pk, old_pending.pk]).update(
+            created_at=timezone.now() - mailer.OUTBOX_RETENTION - timedelta(days=1),
+        )
+        self.assertEqual(mailer.purge_outbox(), 1)
+        self.assertEqual(
+            set(EmailOutbox.objects.values_list('pk', flat=True)), {old_pending.pk, recent_sent.pk},
+        )
+
+
+class UploadSlotTests(TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.upload_dir)
+        settings_override = override_settings(CHUNKED_UPLOAD_DIR=self.upload_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def chunked(self, name):
+        data = b'%PDF-1.4 ' + name.encode()
+        upload = uploads.start_upload('work_experience_cert', name, len(data))
+        uploads.append_chunk(upload.pk, 0, data)
+        return str(upload.pk)
+
+    def test_slots_merge_chunked_and_inline_files(self):
+        inline = SimpleUploadedFile('fallback.pdf', b'%PDF-1.4 fallback')
+        files = uploads.slot_files(
+            [self.chunked('first.pdf'), '', uploads.POSTED_INLINE],
+            [inline],
+            'work_experience_cert',
+        )
+        self.assertEqual([f and f.name for f in files], ['first.pdf', None, 'fallback.pdf'])
+        self.assertIs(files[2], inline)
+        uploads.close_uploads(files)
+        self.assertTrue(files[0].closed)
+
+    def test_start_is_limited_per_client(self):
+        cache.clear()
+        url = reverse('employee_app:public_upload_start')
+        size = uploads.MAX_UPLOAD_SIZE
+        allowed = uploads.UPLOAD_QUOTA_BYTES // size
+        for _ in range(allowed):
+            response = self.client.post(url, {'field': 'resume', 'filename': 'cv.pdf', 'size': size})
+            self.assertEqual(response.status_code, 201)
+        response = self.client.post(url, {'field': 'resume', 'filename': 'cv.pdf', 'size': size})
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post(
+            url, {'field': 'resume', 'filename': 'cv.pdf', 'size': size}, REMOTE_ADDR='10.0.0.2',
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_without_ids_posted_files_are_used_as_is(self):
+        posted = [SimpleUploadedFile('a.pdf', b'%PDF-1.4 a')]
+        self.assertEqual(uploads.slot_files([], posted, 'work_experience_cert'), posted)
+
+
+class NotificationCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user('reader@example.com', 'pw', role='employee')
+        self.assertEqual(get_unread_count(self.user), 0)  # seed the cached counter
+
+    def notify(self):
+        create_notification(self.user, 'test', 'Hello', 'A message', link='/dashboard/')
+        return Notification.objects.filter(recipient=self.user).latest('pk')
+
+    def test_counter_moves_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notify()
+            self.assertEqual(get_unread_count(self.user), 0)
+        self.assertEqual(get_unread_count(self.user), 1)
+
+    def test_rolled_back_notification_leaves_counter_alone(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.notify()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(get_unread_count(self.user), 0)
+
+    def test_open_notification_requires_post(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = self.notify()
+        self.client.force_login(self.user)
+        url = reverse('employee_app:open_notification', args=[notification.pk])
+
+        self.assertEqual(self.client.get(url).status_code, 405)
+        notification.refresh_from_db()
+        self.assertFalse(notification.is_read)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
+        self.assertRedirects(response, '/dashboard/', fetch_redirect_response=False)
+        notification.refresh_from_db()
+        self.assertTrue(notification.is_read)
+        self.assertEqual(get_unread_count(self.user), 0)
+
+
+class MediaResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = use_temp_media_root(self, MEDIA_SENDFILE_MODE=None)
+        with open(f'{self.media_root}/file.txt', 'wb') as fh:
+            fh.write(b'0123456789')
+
+    def get(self, path='file.txt', **headers):
+        request = RequestFactory().get('/media/' + path, headers=headers)
+        response = media_response(request, path)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_path_traversal_is_not_found(self):
+        with self.assertRaises(Http404):
+            self.get('../outside.txt')
+
+    def test_single_range(self):
+        response, body = self.get(Range='bytes=2-4')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, b'234')
+        self.assertEqual(response['Content-Range'], 'bytes 2-4/10')
+
+    def test_invalid_range_syntax_is_ignored(self):
+        response, body = self.get(Range='bytes=5-2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, b'0123456789')
+
+    def test_range_past_the_end_is_unsatisfiable(self):
+        response, _ = self.get(Range='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_unicode_names_in_headers(self):
+        name = 'फोटो "naïve".jpg'
+        with open(f'{self.media_root}/{name}', 'wb') as fh:
+            fh.write(b'jpeg')
+        request = RequestFactory().get('/media/')
+        with override_settings(MEDIA_SENDFILE_MODE='x-accel-redirect', MEDIA_ACCEL_PREFIX='/protected/'):
+            response = media_response(request, name, as_attachment=True)
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            '/protected/%E0%A4%AB%E0%A5%8B%E0%A4%9F%E0%A5%8B%20%22na%C3%AFve%22.jpg',
+        )
+        self.assertIn("filename*=utf-8''", response['Content-Disposition'])
+        self.assertNotIn('=?utf-8?', response['Content-Disposition'])
+
+    def test_compressed_files_keep_their_encoding(self):
+        with open(f'{self.media_root}/export.csv.gz', 'wb') as fh:
+            fh.write(b'\x1f\x8b')
+        response, _ = self.get('export.csv.gz')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+
+class SearchTests(TestCase):
+    def test_mysql_match_skips_stopwords_and_short_tokens(self):
+        tokens = search._tokens('ravi.kumar@example.com in HR')
+        self.assertEqual(search._mysql_terms(tokens), '+ravi* +kumar* +example*')
+
+    def test_finds_user_by_partial_name_and_email(self):
+        user = CustomUser.objects.create_user('Ravi.Kumar@example.com', 'pw', full_name='Ravi Kumar')
+        CustomUser.objects.create_user('someone@example.com', 'pw', full_name='Someone Else')
+        for query in ('kumar', 'ravi.kumar@example.com'):
+            results = search.apply_search(CustomUser.objects.all(), 'user', query)
+            self.assertEqual(list(results), [user], query)
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        self.media_root = use_temp_media_root(self, MEDIA_SENDFILE_MODE=None)
+        cache.clear()
+
+        from PIL import Image
+        os.makedirs(f'{self.media_root}/biodata/photos')
+        Image.new('RGB', (300, 200), 'red').save(f'{self.media_root}/biodata/photos/p.jpg')
+        self.name = 'biodata/photos/p.jpg'
+
+    def test_rendering_touches_no_storage(self):
+        template = Template("{% load thumbnails %}{% thumbnail_picture name 'avatar' %}")
+        with mock.patch.object(thumbnails.default_storage, 'exists') as exists, \
+                mock.patch.object(thumbnails, 'render_thumbnail') as render:
+            html = template.render(Context({'name': self.name}))
+        exists.assert_not_called()
+        render.assert_not_called()
+        self.assertIn(reverse('employee_app:photo_thumbnail', args=['avatar', 'webp', self.name]), html)
+
+    def test_view_builds_derivative_on_first_request(self):
+        admin = CustomUser.objects.create_user('admin@example.com', 'pw', role='super_admin')
+        self.client.force_login(admin)
+        url = thumbnails.thumbnail_url(self.name, 'small', 'jpeg')
+        target = thumbnails.thumbnail_name(self.name, 'small', 'jpeg')
+        self.assertFalse(os.path.exists(f'{self.media_root}/{target}'))
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertTrue(os.path.exists(f'{self.media_root}/{target}'))
+        self.assertEqual(self.client.get(reverse(
+            'employee_app:photo_thumbnail', args=['huge', 'jpeg', self.name],
+        )).status_code, 404)
+
+    def test_view_checks_access(self):
+        employee = CustomUser.objects.create_user('someone@example.com', 'pw', role='employee')
+        self.client.force_login(employee)
+        self.assertEqual(self.client.get(thumbnails.thumbnail_url(self.name)).status_code, 403)
+
+
+class TalentTermTests(SimpleTestCase):
+    def test_split_skills_ignores_case_of_and(self):
+        self.assertEqual(
+            [talent.normalize_skill(s) for s in talent.split_skills('Python And Django, ReactJS & SQL')],
+            ['python', 'django', 'react', 'sql'],
+        )
+
+    def test_and_inside_a_word_is_kept(self):
+        self.assertEqual(talent.split_skills('Pandas/Android'), ['Pandas', 'Android'])
+
+
+def make_biodata(**fields):
+    pdf = b'%PDF-1.4 document'
+    values = {
+        'first_name': 'Ravi', 'last_name': 'Kumar', 'contact_number': '9000000000',
+        'personal_email': 'ravi@example.com', 'experience_type': 'fresher',
+        'photo': 'biodata/photos/ravi.jpg', 'technical_skills': 'Python',
+        'ssc_school': 'School', 'ssc_year': 2010, 'ssc_grade': 'A',
+        'sslc_school': 'School', 'sslc_year': 2012, 'sslc_grade': 'A',
+        'ug_degree': 'BSc', 'ug_institution': 'College', 'ug_year': 2016,
+        'status': 'approved',
+    }
+    values.update(fields)
+    bio = BioDataRequest(**values)
+    for field in ('resume', 'ssc_marksheet', 'sslc_marksheet', 'ug_documents'):
+        if not getattr(bio, field):
+            getattr(bio, field).save(f'{field}.pdf', SimpleUploadedFile(f'{field}.pdf', pdf), save=False)
+    bio.save()
+    return bio
+
+
+class DocumentRefcountTests(TestCase):
+    def setUp(self):
+        self.media_root = use_temp_media_root(self)
+
+        from PIL import Image
+        os.makedirs(f'{self.media_root}/biodata/photos')
+        Image.new('RGB', (80, 80)).save(f'{self.media_root}/biodata/photos/ravi.jpg')
+        self.bio = make_biodata()
+        admin = CustomUser.objects.create_user('admin@example.com', 'pw', role='super_admin')
+        self.client.force_login(admin)
+
+    def post_edit(self, **files):
+        form = BioDataEditForm(instance=self.bio)
+        data = {
+            name: value for name, value in form.initial.items()
+            if name in form.fields and value is not None
+            and not isinstance(form.fields[name], forms.FileField)
+        }
+        data.update(files)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('employee_app:edit_biodata', args=[self.bio.pk]), data)
+        self.assertEqual(response.status_code, 302, getattr(response, 'context', None) and response.context['form'].errors)
+        self.bio.refresh_from_db()
+
+    def test_reuploading_same_bytes_keeps_one_reference(self):
+        # four fields share the same bytes
+        self.assertEqual(StoredBlob.objects.get(name=self.bio.resume.name).refcount, 4)
+        self.post_edit(resume=SimpleUploadedFile('again.pdf', b'%PDF-1.4 document'))
+        self.assertEqual(StoredBlob.objects.get(name=self.bio.resume.name).refcount, 4)
+
+    def test_replaced_document_is_released(self):
+        old_name = self.bio.resume.name
+        self.post_edit(resume=SimpleUploadedFile('new.pdf', b'%PDF-1.4 new resume'))
+        self.assertNotEqual(self.bio.resume.name, old_name)
+        self.assertEqual(StoredBlob.objects.get(name=old_name).refcount, 3)
+        self.assertEqual(StoredBlob.objects.get(name=self.bio.resume.name).refcount, 1)
+
+
+@override_settings(EMAIL_OUTBOX_RUNNER='worker')
+class InvitationImportTests(TestCase):
+    def setUp(self):
+        use_temp_media_root(self)
+
+    def import_csv(self, text):
+        upload = SimpleUploadedFile('invites.csv', text.encode())
+        return invitations.import_invitations(
+            invitations.read_invitation_file(upload), lambda name: ('Invitation', f'Dear {name}'),
+        )
+
+    def test_dedup_and_skip_counts(self):
+        CustomUser.objects.create_user('Mixed@Example.com', 'pw')
+        BiodataInvitation.objects.create(name='Old', email='Invited@Example.com')
+        make_biodata(personal_email='Submitted@Example.com', photo='')
+
+        accepted, skipped = self.import_csv(
+            'Name,Email,Phone\n'
+            'New Person,new@example.com,900\n'
+            'Again,NEW@example.com,\n'
+            'Mixed,mixed@example.com,\n'
+            'Invited,invited@example.com,\n'
+            'Submitted,submitted@EXAMPLE.com,\n'
+            ',nameless@example.com,\n'
+            'Bad,not-an-email,\n'
+        )
+
+        self.assertEqual(accepted, 1)
+        self.assertEqual(skipped, {'invalid': 2, 'duplicate': 1, 'submitted': 1, 'registered': 1, 'invited': 1})
+        invitation = BiodataInvitation.objects.get(email='new@example.com')
+        self.assertEqual((invitation.name, invitation.phone), ('New Person', '900'))
+        self.assertEqual(list(EmailOutbox.objects.values_list('to', flat=True)), [['new@example.com']])
+
+    def test_xlsx_workbook_is_closed(self):
+        import openpyxl
+        wb = openpyxl.Workbook()
+        wb.active.append(['Email', 'Name'])
+        wb.active.append(['A@Example.com', 'A'])
+        data = io.BytesIO()
+        wb.save(data)
+
+        load_workbook, opened = openpyxl.load_workbook, []
+
+        def load(*args, **kwargs):
+            opened.append(load_workbook(*args, **kwargs))
+            return opened[-1]
+
+        with mock.patch.object(invitations.openpyxl, 'load_workbook', side_effect=load):
+            rows = list(invitations.read_invitation_file(SimpleUploadedFile('invites.xlsx', data.getvalue())))
+        self.assertEqual(rows, [{'name': 'A', 'email': 'a@example.com', 'phone': ''}])
+        self.assertIsNone(opened[0]._archive.fp)
+
+
+class MetricCounterTests(TestCase):
+    def setUp(self):
+        use_temp_media_root(self)
+
+    def stored(self):
+        return {
+            (metric, dimension): value
+            for metric, dimension, value in MetricCounter.objects.values_list('metric', 'dimension', 'value')
+            if value
+        }
+
+    def assertRollupMatchesSource(self):
+        self.assertEqual(self.stored(), {key: value for key, value in metrics.compute_counts().items() if value})
+
+    def test_user_create_update_delete(self):
+        user = CustomUser.objects.create_user('a@example.com', 'pw', role='employee', department='hr')
+        self.assertEqual(self.stored()[('users_by_role', 'employee')], 1)
+        self.assertEqual(self.stored()[('users_by_department', 'hr')], 1)
+
+        user.role = 'trainer'
+        user.save()
+        self.assertNotIn(('users_by_role', 'employee'), self.stored())
+        self.assertEqual(self.stored()[('users_by_role', 'trainer')], 1)
+        self.assertRollupMatchesSource()
+
+        user.delete()
+        self.assertEqual(self.stored(), {})
+
+    def test_update_fields_outside_the_metric_are_skipped(self):
+        user = CustomUser.objects.create_user('a@example.com', 'pw', role='employee')
+        user.full_name = 'Someone'
+        user.role = 'trainer'  # not saved below
+        with CaptureQueriesContext(connection) as queries:
+            user.save(update_fields=['full_name'])
+        # neither the before-state SELECT nor a counter UPDATE
+        self.assertFalse([q for q in queries if 'metriccounter' in q['sql'] or '"role"' in q['sql']])
+        self.assertEqual(self.stored()[('users_by_role', 'employee')], 1)
+        self.assertRollupMatchesSource()
+
+        user.save(update_fields=['role'])
+        self.assertEqual(self.stored()[('users_by_role', 'trainer')], 1)
+        self.assertRollupMatchesSource()
+
+    def test_biodata_approval_is_timed(self):
+        bio = make_biodata(status='pending', photo='')
+        self.assertEqual(self.stored()[('biodata_by_status', 'pending')], 1)
+        bio.status = 'approved'
+        bio.approved_at = bio.created_at + timedelta(days=2)
+        bio.save()
+        self.assertEqual(self.stored()[('approvals_timed', '')], 1)
+        self.assertEqual(self.stored()[('approval_seconds', '')], 2 * 86400)
+        self.assertRollupMatchesSource()
+
+    def test_invitations(self):
+        invitation = BiodataInvitation.objects.create(name='A', email='a@example.com')
+        invitation.submitted = True
+        invitation.save()
+        self.assertEqual(self.stored()[('invitations_sent', '')], 1)
+        self.assertEqual(self.stored()[('invitations_submitted', '')], 1)
+        self.assertRollupMatchesSource()
+
+    def test_reconcile_corrects_drift(self):
+        CustomUser.objects.create_user('a@example.com', 'pw', role='employee')
+        MetricCounter.objects.filter(metric='users_by_role', dimension='employee').update(value=7)
+        MetricCounter.objects.create(metric='users_by_role', dimension='ghost', value=3)
+
+        self.assertEqual(metrics.reconcile(), [('users_by_role', 'employee'), ('users_by_role', 'ghost')])
+        self.assertRollupMatchesSource()
+        self.assertEqual(metrics.reconcile(), [])
+
+
+class BatchProgressTests(TestCase):
+    def setUp(self):
+        self.batch = self.make_batch('Alpha')
+        self.other = self.make_batch('Beta')
+        self.sessions = [self.make_session(self.batch, i) for i in range(4)]
+
+    def make_batch(self, name):
+        return Batch.objects.create(name=name, start_date=date(2026, 1, 1), end_date=date(2026, 6, 1))
+
+    def make_session(self, batch, i, status='pending'):
+        return Session.objects.create(title=f'Session {i}', batch=batch, date_time=timezone.now(), status=status)
+
+    def progress(self, batch):
+        return Batch.objects.values_list('progress', flat=True).get(pk=batch.pk)
+
+    def test_status_change_refreshes_progress(self):
+        self.assertEqual(self.progress(self.batch), 0)
+        session = self.sessions[0]
+        session.status = 'completed'
+        session.save()
+        self.assertEqual(self.progress(self.batch), 25.0)
+        self.make_session(self.batch, 5)
+        self.assertEqual(self.progress(self.batch), 20.0)
+
+    def test_moving_a_session_refreshes_both_batches(self):
+        self.sessions[0].status = 'completed'
+        self.sessions[0].save()
+        moved = self.sessions[0]
+        moved.batch = self.other
+        moved.save(update_fields=['batch'])
+        self.assertEqual(self.progress(self.batch), 0)
+        self.assertEqual(self.progress(self.other), 100.0)
+
+    def test_deleting_a_session_refreshes_progress(self):
+        self.sessions[0].status = 'completed'
+        self.sessions[0].save()
+        self.sessions[1].delete()
+        self.assertEqual(self.progress(self.batch), round(100 / 3, 1))
+
+    def test_attendance_only_save_skips_the_refresh(self):
+        session = self.sessions[0]
+        session.attendance_taken = True
+        with self.assertNumQueries(1):
+            session.save(update_fields=['attendance_taken'])
+        # an unchanged full save reads the old state but doesn't recompute
+        with CaptureQueriesContext(connection) as queries:
+            session.save()
+        self.assertFalse([q for q in queries if 'employee_app_batch' in q['sql']])
+
+
+class ExportPurgeTests(TestCase):
+    def setUp(self):
+        self.media_root = use_temp_media_root(self)
+        self.user = CustomUser.objects.create_user('admin@example.com', 'pw', role='super_admin')
+
+    def job(self, status, age):
+        job = ExportJob(kind='users', status=status, requested_by=self.user,
+                        finished_at=timezone.now() - age if status != 'running' else None)
+        job.file.save('users.xlsx', SimpleUploadedFile('users.xlsx', b'PK'), save=False)
+        job.save()
+        return job
+
+    def test_purge_removes_expired_jobs_and_their_files(self):
+        expired = self.job('completed', export_jobs.EXPORT_RETENTION + timedelta(hours=1))
+        recent = self.job('completed', timedelta(hours=1))
+        running = self.job('running', timedelta(0))
+        expired_dir = os.path.dirname(expired.file.path)
+
+        self.assertEqual(export_jobs.purge_exports(), 1)
+        self.assertFalse(os.path.exists(expired_dir))
+        self.assertTrue(os.path.exists(recent.file.path))
+        self.assertEqual(set(ExportJob.objects.values_list('pk', flat=True)), {recent.pk, running.pk})
@@ -0,0 +1,136 @@
+# employee_app/thumbnails.py
+import hashlib
+import logging
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# name -> (width, height); images are cropped to fill the box
+THUMBNAIL_SIZES = {
+    'avatar': (64, 64),
+    'small': (160, 160),
+    'medium': (400, 400),
+}
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+THUMBNAIL_ROOT = 'thumbs'
+THUMBNAIL_CACHE_KEY = 'thumbs:{}'
+THUMBNAIL_CACHE_TIMEOUT = 60 * 60 * 24
+THUMBNAIL_FAILURE_TIMEOUT = 60 * 60
+
+# sizes generated as soon as a photo is uploaded
+EAGER_THUMBNAILS = [('avatar', 'webp'), ('avatar', 'jpeg'), ('small', 'webp'), ('small', 'jpeg')]
+
+
+def _source_name(source):
+    return getattr(source, 'name', source) or ''
+
+
+def thumbnail_dir(name):
+    # hash of the original path, so a replaced photo never reuses stale derivatives
+    return f"{THUMBNAIL_ROOT}/{hashlib.sha1(name.encode()).hexdigest()[:16]}"
+
+
+def thumbnail_name(name, size, fmt):
+    return f"{thumbnail_dir(name)}/{size}.{THUMBNAIL_FORMATS[fmt][1]}"
+
+
+def render_thumbnail(fileobj, size, fmt):
+    """
+    Returns the encoded bytes of `fileobj` cropped to the named size.
+    """
+    width, height = THUMBNAIL_SIZES[size]
+    pil_format, _, options = THUMBNAIL_FORMATS[fmt]
+
+    with Image.open(fileobj) as img:
+        img.draft('RGB', (width * 2, height * 2))  # cheap JPEG downscale on decode
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA') or (img.mode == 'RGBA' and pil_format == 'JPEG'):
+            img = img.convert('RGB')
+        img = ImageOps.fit(img, (width, height), Image.LANCZOS)
+        out = BytesIO()
+        img.save(out, pil_format, **options)
+    return out.getvalue()
+
+
+def generate_thumbnail(source, size, fmt, storage=None):
+    """
+    Writes one derivative to storage (overwriting any existing one) and
+    returns its storage name, or None when the source can't be decoded.
+    """
+    storage = storage or default_storage
+    name = _source_name(source)
+    target = thumbnail_name(name, size, fmt)
+
+    try:
+        with storage.open(name, 'rb') as fh:
+            data = render_thumbnail(fh, size, fmt)
+    except (FileNotFoundError, UnidentifiedImageError, OSError) as e:
+        logger.warning("Could not build %s/%s thumbnail for %s: %s", size, fmt, name, e)
+        return None
+
+    if storage.exists(target):
+        storage.delete(target)
+    storage.save(target, ContentFile(data))
+    cache.set(THUMBNAIL_CACHE_KEY.format(target), True, THUMBNAIL_CACHE_TIMEOUT)
+    return target
+
+
+def thumbnail_url(source, size='avatar', fmt='webp'):
+    """
+    URL of the view that serves a derivative of `source` (a FieldFile or
+    storage name). Touches neither storage nor cache, so list pages can call
+    it per row; the derivative is built when the image itself is requested.
+    """
+    name = _source_name(source)
+    if not name:
+        return ''
+    return reverse('employee_app:photo_thumbnail', args=[size, fmt, name])
+
+
+def ensure_thumbnail(source, size, fmt, storage=None):
+    """
+    Storage name of a derivative of `source`, generated on first use, or
+    None when it can't be built.
+    """
+    storage = storage or default_storage
+    name = _source_name(source)
+    target = thumbnail_name(name, size, fmt)
+    key = THUMBNAIL_CACHE_KEY.format(target)
+    state = cache.get(key)
+    if state is False:
+        # decoding failed recently; don't retry on every request
+        return None
+    if state:
+        return target
+    if storage.exists(target):
+        cache.set(key, True, THUMBNAIL_CACHE_TIMEOUT)
+        return target
+
+    if generate_thumbnail(name, size, fmt, storage=storage):
+        return target
+    cache.set(key, False, THUMBNAIL_FAILURE_TIMEOUT)
+    return None
+
+
+def generate_eager_thumbnails(name, storage=None):
+    for size, fmt in EAGER_THUMBNAILS:
+        generate_thumbnail(name, size, fmt, storage=storage)
+
+
+def delete_thumbnails(name, storage=None):
+    storage = storage or default_storage
+    for size in THUMBNAIL_SIZES:
+        for fmt in THUMBNAIL_FORMATS:
+            target = thumbnail_name(name, size, fmt)
+            cache.delete(THUMBNAIL_CACHE_KEY.format(target))
+            if storage.exists(target):
+                storage.delete(target)
@@ -0,0 +1,218 @@
+# employee_app/uploads.py
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ChunkedUpload
+
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # same limit BioDataForm.clean enforces
+UPLOAD_CHUNK_SIZE = 512 * 1024
+UPLOAD_EXPIRY = timedelta(hours=24)
+
+# bytes one client (by IP) may reserve per window; a full form with a
+# handful of certificates stays well under it
+UPLOAD_QUOTA_BYTES = 100 * 1024 * 1024
+UPLOAD_QUOTA_WINDOW = 60 * 60
+UPLOAD_QUOTA_KEY = 'uploads:reserved:{}'
+
+# form fields that accept chunked uploads
+UPLOAD_FIELDS = (
+    'photo', 'resume', 'aadhar_card', 'pan_card',
+    'ssc_marksheet', 'sslc_marksheet', 'ug_documents', 'pg_documents',
+    'cert_document', 'work_experience_cert',
+)
+
+# magic bytes -> content type; checked against the first chunk
+FILE_SIGNATURES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+)
+IMAGE_ONLY_FIELDS = ('photo',)
+
+# `<field>_upload[]` value for a repeated-input slot whose file was posted in
+# the multipart body (its chunked upload failed or never started)
+POSTED_INLINE = 'inline'
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def upload_path(upload_id):
+    return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{upload_id}.part")
+
+
+def sniff_content_type(data):
+    for signature, content_type in FILE_SIGNATURES:
+        if data.startswith(signature):
+            return content_type
+    return None
+
+
+def reserve_quota(client, size):
+    """
+    Counts `size` bytes against `client`'s quota for the current window,
+    so anonymous callers can't fill CHUNKED_UPLOAD_DIR.
+    """
+    key = UPLOAD_QUOTA_KEY.format(client)
+    cache.add(key, 0, UPLOAD_QUOTA_WINDOW)
+    try:
+        reserved = cache.incr(key, size)
+    except ValueError:
+        # expired between add() and incr()
+        cache.set(key, size, UPLOAD_QUOTA_WINDOW)
+        reserved = size
+    if reserved > UPLOAD_QUOTA_BYTES:
+        raise UploadError("Too many uploads from this address; try again later.", status=429)
+
+
+def start_upload(field_name, filename, size, client=None):
+    """
+    Registers a new upload after checking the declared size and, when
+    `client` is given, that client's upload quota.
+    """
+    if field_name not in UPLOAD_FIELDS:
+        raise UploadError("Unknown upload field.")
+    if not filename:
+        raise UploadError("Missing file name.")
+    if size <= 0:
+        raise UploadError("Empty file.")
+    if size > MAX_UPLOAD_SIZE:
+        raise UploadError("File too large (max 5MB)", status=413)
+    if client:
+        reserve_quota(client, size)
+
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    return ChunkedUpload.objects.create(
+        field_name=field_name,
+        filename=os.path.basename(filename)[:255],
+        size=size,
+    )
+
+
+def append_chunk(upload_id, offset, data):
+    """
+    Appends `data` at `offset`. A mismatched offset is rejected with the
+    server's offset so the client can resume from there.
+    """
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().filter(pk=upload_id).first()
+        if upload is None:
+            raise UploadError("Upload not found.", status=404)
+        if upload.status != 'uploading':
+            raise UploadError("Upload already finished.", status=409, offset=upload.received)
+        if offset != upload.received:
+            raise UploadError("Offset mismatch.", status=409, offset=upload.received)
+        if upload.received + len(data) > upload.size:
+            raise UploadError("Chunk exceeds the declared size.", status=413, offset=upload.received)
+
+        content_type = sniff_content_type(data) if offset == 0 else upload.content_type
+        rejected = content_type is None or (
+            upload.field_name in IMAGE_ONLY_FIELDS and not content_type.startswith('image/')
+        )
+        if rejected:
+            upload.delete()
+        else:
+            # write at the offset and truncate, so a chunk whose commit failed is simply overwritten
+            with open(upload_path(upload.pk), 'r+b' if offset else 'wb') as fh:
+                fh.seek(offset)
+                fh.write(data)
+                fh.truncate()
+
+            upload.content_type = content_type
+            upload.received += len(data)
+            if upload.received == upload.size:
+                upload.status = 'complete'
+            upload.save(update_fields=['content_type', 'received', 'status', 'updated_at'])
+
+    if rejected:
+        raise UploadError("Only PDF, JPG, JPEG, PNG allowed", status=415)
+    return upload
+
+
+def claim_upload(upload_id, field_name):
+    """
+    Returns the finished upload for `field_name` as an UploadedFile, or None.
+    """
+    try:
+        upload = ChunkedUpload.objects.get(pk=upload_id, field_name=field_name, status='complete')
+    except (ChunkedUpload.DoesNotExist, ValidationError):
+        return None
+    path = upload_path(upload.pk)
+    if not os.path.exists(path):
+        return None
+    uploaded = UploadedFile(
+        file=open(path, 'rb'),
+        name=upload.filename,
+        content_type=upload.content_type,
+        size=upload.size,
+    )
+    uploaded.upload_id = upload.pk
+    return uploaded
+
+
+def slot_files(upload_ids, posted_files, field_name):
+    """
+    One file (or None) per slot of a repeated file input such as
+    work_experience_cert[]. `upload_ids` has an entry per slot: a chunked
+    upload id, POSTED_INLINE when that slot's file is in `posted_files`, or
+    blank. Without any ids (no JS), `posted_files` is used as is.
+    """
+    if not upload_ids:
+        return list(posted_files)
+    posted = iter(posted_files)
+    files = []
+    for upload_id in upload_ids:
+        if upload_id == POSTED_INLINE:
+            files.append(next(posted, None))
+        elif upload_id:
+            files.append(claim_upload(upload_id, field_name))
+        else:
+            files.append(None)
+    return files
+
+
+def close_uploads(files):
+    """
+    Closes claimed uploads without deleting them, e.g. when the form was
+    invalid; the parts stay until purge_uploads expires them.
+    """
+    for f in files:
+        if getattr(f, 'upload_id', None):
+            f.close()
+
+
+def release_uploads(files):
+    """
+    Deletes claimed uploads and their assembled files once they've been stored.
+    """
+    ids = []
+    for f in files:
+        if getattr(f, 'upload_id', None):
+            f.close()
+            ids.append(f.upload_id)
+            if os.path.exists(upload_path(f.upload_id)):
+                os.remove(upload_path(f.upload_id))
+    if ids:
+        ChunkedUpload.objects.filter(pk__in=ids).delete()
+
+
+def purge_stale_uploads(now=None):
+    cutoff = (now or timezone.now()) - UPLOAD_EXPIRY
+    stale = list(ChunkedUpload.objects.filter(updated_at__lt=cutoff))
+    for upload in stale:
+        path = upload_path(upload.pk)
+        if os.path.exists(path):
+            os.remove(path)
+    ChunkedUpload.objects.filter(pk__in=[u.pk for u in stale]).delete()
+    return len(stale)
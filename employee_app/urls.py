@@ -15,6 +15,7 @@ urlpatterns = [
     path('logout/', logout_view, name='logout'),
 
     path('users/', users_manager, name='users_manager'),
+    path('users/data/', views.users_manager_data, name='users_manager_data'),
     path('users/create/', create_user, name='create_user'),
     path('users/edit/<int:user_id>/', edit_user, name='edit_user'),
     path('users/delete/<int:user_id>/', delete_user, name='delete_user'),
@@ -29,19 +30,31 @@ urlpatterns = [
 
     path('public_biodata_form/', views.public_biodata_form, name='public_biodata_form'),
     path('biodata/public/', views.public_biodata_form, name='public_biodata_form'),
+    path('biodata/public/uploads/', views.public_upload_start, name='public_upload_start'),
+    path('biodata/public/uploads/<uuid:upload_id>/', views.public_upload_chunk, name='public_upload_chunk'),
     path('biodata/requests/', views.pending_requests, name='pending_requests'),
     path('biodata/review/<int:pk>/', views.review_biodata_detail, name='review_biodata_detail'),
     path('biodata/employees/', views.biodata_list, name='biodata_list'),
+    path('biodata/talent/', views.talent_search, name='talent_search'),
     path('biodata/view/<int:pk>/', views.view_biodata, name='view_biodata'),
     path('biodata/edit/<int:pk>/', views.edit_biodata, name='edit_biodata'),
     path('biodata/delete/<int:pk>/', views.delete_biodata, name='delete_biodata'),
     path('biodata/export/', views.export_biodata_excel, name='export_biodata_excel'),
 
+    path('exports/<str:schema>.<str:fmt>', views.export_data, name='export_data'),
+    path('exports/<str:kind>/start/', views.start_export, name='start_export'),
+    path('exports/<int:pk>/status/', views.export_status, name='export_status'),
+    path('exports/<int:pk>/download/', views.download_export, name='download_export'),
+    path('thumbnails/<str:size>/<str:fmt>/<path:path>', views.photo_thumbnail, name='photo_thumbnail'),
+
     path('settings/', views.app_settings, name='settings'),
     path('api/settings/change_password/', views.change_password, name='change_password'),
     path('api/settings/signout_all/', views.sign_out_all_devices, name='signout_all'),
 
     path('notifications/mark-all-read/', views.mark_all_read, name='mark_all_read'),
+    path('notifications/<int:pk>/open/', views.open_notification, name='open_notification'),
+    path('notifications/poll/', views.notifications_poll, name='notifications_poll'),
+    path('notifications/stream/', views.notifications_stream, name='notifications_stream'),
     path('notifications/all/', views.notifications_all, name='notifications_all'),
 
 
@@ -55,6 +68,7 @@ urlpatterns = [
     path('biodata/delete-pending/<int:pk>/', views.delete_pending_request, name='delete_pending_request'),
     path('biodata/delete-approved/<int:pk>/', views.delete_approved_employee, name='delete_approved_employee'),
     path('biodata/send-invitation/', views.send_biodata_invitation, name='send_biodata_invitation'),
+    path('biodata/import-invitations/', views.import_biodata_invitations, name='import_biodata_invitations'),
     path('biodata/invitation/delete/<int:invitation_id>/', views.delete_biodata_invitation, name='delete_biodata_invitation'),
 
 
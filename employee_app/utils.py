@@ -1,3 +1,12 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Left
+from django.utils.dateparse import parse_datetime
+
 from employee_app.permission_defaults import ROLE_PERMISSIONS
 
 
@@ -14,8 +23,153 @@ def has_permission(user, module, action='view'):
 
     return permissions.get(module, {}).get(action, False)
 
+def keyset_page(queryset, after, page_size, field):
+    """
+    One page of `queryset`, newest first on (`field`, id), starting after the
+    `<field value>_<id>` cursor. Returns (rows, next_cursor or None).
+    """
+    queryset = queryset.order_by(f'-{field}', '-pk')
+
+    value, _, pk = (after or '').rpartition('_')
+    value = parse_datetime(value) if value else None
+    if value and pk.isdigit():
+        # the redundant lte bound lets a (field, id) index do a range scan
+        queryset = queryset.filter(
+            Q(**{f'{field}__lte': value}),
+            Q(**{f'{field}__lt': value}) | Q(pk__lt=int(pk)),
+        )
+
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = f"{getattr(rows[-1], field).isoformat()}_{rows[-1].pk}" if has_more else None
+    return rows, next_cursor
+
+
 # employee_app/utils.py
-from .models import Notification
+from django.contrib.sessions.models import Session
+
+from .models import CustomUser, Notification, UserSession
+from .notification_stream import broker
+
+ADMIN_ROLES = ['admin', 'super_admin']
+
+# Short, so a counter that drifted (lost incr, another host's cache) heals
+# from the database within a minute
+NOTIFICATION_CACHE_TIMEOUT = 60
+
+UNREAD_COUNT_KEY = 'notifications:unread:{}'
+
+RECENT_FEED_KEY = 'notifications:recent:{}'
+RECENT_FEED_SIZE = 8
+# One extra character so `truncatechars:60` still adds the ellipsis.
+RECENT_FEED_SUMMARY_LENGTH = 61
+
+
+def get_unread_count(user):
+    """
+    Returns the user's unread notification count from the cache,
+    falling back to a COUNT query (and re-seeding the cache) on a miss.
+    """
+    key = UNREAD_COUNT_KEY.format(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(recipient=user, is_read=False).count()
+        cache.add(key, count, NOTIFICATION_CACHE_TIMEOUT)
+    return count
+
+
+def get_notification_header(user):
+    """
+    Returns (unread_count, recent) for the navbar bell and dropdown.
+    `recent` is a cached list of dicts holding only the columns the
+    dropdown renders. On a cold cache both values come from one query.
+    """
+    unread_key = UNREAD_COUNT_KEY.format(user.pk)
+    recent_key = RECENT_FEED_KEY.format(user.pk)
+    cached = cache.get_many([unread_key, recent_key])
+    unread_count = cached.get(unread_key)
+    recent = cached.get(recent_key)
+
+    if recent is None:
+        unread_total = Notification.objects.filter(
+            recipient=OuterRef('recipient'), is_read=False
+        ).order_by().values('recipient').annotate(total=Count('pk')).values('total')
+
+        rows = list(
+            Notification.objects.filter(recipient=user)
+            .annotate(
+                summary=Left('message', RECENT_FEED_SUMMARY_LENGTH),
+                unread_total=Coalesce(Subquery(unread_total), 0),
+            )
+            .values('id', 'title', 'summary', 'link', 'is_read', 'created_at', 'unread_total')
+            [:RECENT_FEED_SIZE]
+        )
+        recent = []
+        for row in rows:
+            if unread_count is None:
+                unread_count = row['unread_total']
+                cache.add(unread_key, unread_count, NOTIFICATION_CACHE_TIMEOUT)
+            del row['unread_total']
+            recent.append(row)
+        if unread_count is None:
+            # No notifications at all
+            unread_count = 0
+            cache.add(unread_key, unread_count, NOTIFICATION_CACHE_TIMEOUT)
+        cache.set(recent_key, recent, NOTIFICATION_CACHE_TIMEOUT)
+    elif unread_count is None:
+        unread_count = get_unread_count(user)
+
+    return unread_count, recent
+
+
+def invalidate_recent_feed(user_ids):
+    cache.delete_many([RECENT_FEED_KEY.format(user_id) for user_id in user_ids])
+
+
+def adjust_unread_count(user_ids, delta):
+    """
+    Shifts the cached counters. Missing keys are left alone so the next read
+    recomputes them from the database. incr() is atomic on Redis; on the
+    file-based fallback two concurrent shifts can lose one, which heals when
+    the key expires.
+    """
+    for user_id in user_ids:
+        try:
+            if cache.incr(UNREAD_COUNT_KEY.format(user_id), delta) < 0:
+                cache.delete(UNREAD_COUNT_KEY.format(user_id))
+        except ValueError:
+            pass
+
+
+def reset_unread_count(user):
+    cache.set(UNREAD_COUNT_KEY.format(user.pk), 0, NOTIFICATION_CACHE_TIMEOUT)
+
+
+def mark_notifications_read(user, notification_ids=None):
+    """
+    Marks all (or the given) unread notifications of `user` as read and
+    keeps the cached unread counter in sync.
+    """
+    unread = Notification.objects.filter(recipient=user, is_read=False)
+    if notification_ids is None:
+        unread.update(is_read=True)
+
+        def refresh():
+            reset_unread_count(user)
+            invalidate_recent_feed([user.pk])
+
+        transaction.on_commit(refresh)
+        return
+    updated = unread.filter(pk__in=notification_ids).update(is_read=True)
+    if updated:
+
+        def refresh():
+            adjust_unread_count([user.pk], -updated)
+            invalidate_recent_feed([user.pk])
+
+        transaction.on_commit(refresh)
+
 
 def create_notification(recipient, ntype, title, message, link=None):
     """
@@ -29,3 +183,82 @@ def create_notification(recipient, ntype, title, message, link=None):
             message=message,
             link=link,
         )
+
+        # counters, feed and push only once the row is committed
+        def announce():
+            adjust_unread_count([recipient.pk], 1)
+            invalidate_recent_feed([recipient.pk])
+            broker.publish([recipient.pk], {'type': ntype, 'title': title, 'link': link})
+
+        transaction.on_commit(announce)
+
+
+def _bulk_notify(recipient_ids, ntype, title, message, link=None):
+    recipient_ids = list(recipient_ids)
+    Notification.objects.bulk_create([
+        Notification(
+            recipient_id=recipient_id,
+            notification_type=ntype,
+            title=title,
+            message=message,
+            link=link,
+        )
+        for recipient_id in recipient_ids
+    ])
+    adjust_unread_count(recipient_ids, 1)
+    invalidate_recent_feed(recipient_ids)
+    broker.publish(recipient_ids, {'type': ntype, 'title': title, 'link': link})
+
+
+def notify_many(recipients, ntype, title, message, link=None):
+    """
+    Sends the same notification to many users with a single batched INSERT.
+    `recipients` can be a CustomUser queryset or any iterable of users;
+    inactive users are skipped. The rows are written once the current
+    transaction commits.
+    """
+    if hasattr(recipients, 'values_list'):
+        recipient_ids = list(recipients.filter(is_active=True).values_list('pk', flat=True))
+    else:
+        recipient_ids = [user.pk for user in recipients if user and user.is_active]
+
+    if recipient_ids:
+        transaction.on_commit(
+            lambda: _bulk_notify(recipient_ids, ntype, title, message, link)
+        )
+
+
+def notify_role(roles, ntype, title, message, link=None):
+    """
+    Notifies every active user holding one of `roles`, e.g. ADMIN_ROLES.
+    Recipients are resolved with one query after the transaction commits.
+    """
+    roles = list(roles)
+
+    def fan_out():
+        recipient_ids = CustomUser.objects.filter(
+            role__in=roles, is_active=True
+        ).values_list('pk', flat=True)
+        _bulk_notify(recipient_ids, ntype, title, message, link)
+
+    transaction.on_commit(fan_out)
+
+
+def end_user_sessions(user):
+    """
+    Signs `user` out everywhere using the UserSession index: one indexed
+    lookup and a bulk delete instead of decoding every session row.
+    """
+    user_sessions = UserSession.objects.filter(user=user)
+    session_keys = list(user_sessions.values_list('session_key', flat=True))
+
+    Session.objects.filter(session_key__in=session_keys).delete()
+    user_sessions.delete()
+
+    # cache / cached_db engines also keep a copy of each session in the cache
+    store_class = import_module(settings.SESSION_ENGINE).SessionStore
+    prefix = getattr(store_class, 'cache_key_prefix', None)
+    if prefix:
+        caches[settings.SESSION_CACHE_ALIAS].delete_many(
+            [prefix + session_key for session_key in session_keys]
+        )
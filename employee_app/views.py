@@ -14,11 +14,17 @@ from django.contrib.auth.hashers import make_password
 import openpyxl
 from openpyxl.styles import Font
 from django.urls import reverse
+from django.db.models import F
 from .utils import create_notification  
 
 from .models import CustomUser
 from employee_app.permission_defaults import ROLE_PERMISSIONS
-from employee_app.utils import create_notification, has_permission
+from employee_app.utils import ADMIN_ROLES, create_notification, has_permission, notify_role
+from .exports import EXPORT_SCHEMAS, EXPORT_WRITERS, export_response, filtered_users
+from .thumbnails import THUMBNAIL_FORMATS, THUMBNAIL_SIZES, ensure_thumbnail, thumbnail_url
+from .utils import keyset_page
+from .metrics import dashboard_metrics
+from django.http import JsonResponse
 
 def login_view(request):
     if request.user.is_authenticated:
@@ -55,8 +61,55 @@ def users_manager(request):
     if not has_permission(request.user, 'users', 'view'):
         return HttpResponse('Access Denied', status=403)
 
-    users = CustomUser.objects.all().order_by('-date_joined')
-    return render(request, 'employee_app/users_manager.html', {'users': users})
+    users, next_cursor, filters = _users_page(request)
+    return render(request, 'employee_app/users_manager.html', {
+        'users': users,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
+        'filters': filters,
+        'role_choices': CustomUser.ROLE_CHOICES,
+        'department_choices': [c for c in CustomUser.DEPARTMENT_CHOICES if c[0]],
+        'status_choices': CustomUser.STATUS_CHOICES,
+    })
+
+
+@login_required
+def users_manager_data(request):
+    """
+    JSON page of the users table, for incremental loading.
+    """
+    if not has_permission(request.user, 'users', 'view'):
+        return HttpResponse('Access Denied', status=403)
+
+    users, next_cursor, _ = _users_page(request)
+    return JsonResponse({
+        'users': [{
+            'id': u.pk,
+            'full_name': u.full_name,
+            'email': u.email,
+            'role': u.role,
+            'role_display': u.get_role_display(),
+            'department_display': u.get_department_display(),
+            'status': u.status,
+            'status_display': u.get_status_display(),
+            'avatar': thumbnail_url(u.photo, 'avatar') if u.photo else None,
+        } for u in users],
+        'next_cursor': next_cursor,
+    })
+
+
+USERS_PAGE_SIZE = 25
+
+
+def _users_page(request):
+    """
+    One page of the filtered users list, keyset-paginated on (date_joined, id)
+    with `?after=<cursor>`. Returns (users, next_cursor, filters).
+    """
+    filters = {key: request.GET.get(key, '').strip() for key in ('search', 'role', 'department', 'status')}
+    users = filtered_users(**filters).annotate(photo=F('bio_data_request__photo'))
+    users, next_cursor = keyset_page(users, request.GET.get('after'), USERS_PAGE_SIZE, 'date_joined')
+    return users, next_cursor, filters
 
 
 
@@ -105,13 +158,12 @@ def create_user(request):
                     messages.warning(request, "Selected biodata not found or not approved.")
 
         # Notification
-        for notifier in CustomUser.objects.filter(role__in=['admin', 'super_admin']):
-            create_notification(
-                notifier,
-                'user_created',
-                'New User Created',
-                f"{new_user.email} ({new_user.get_role_display()}) created by {request.user.email}.",
-            )
+        notify_role(
+            ADMIN_ROLES,
+            'user_created',
+            'New User Created',
+            f"{new_user.email} ({new_user.get_role_display()}) created by {request.user.email}.",
+        )
 
         messages.success(request, f'User {email} created successfully.')
         return redirect('employee_app:users_manager')
@@ -172,13 +224,12 @@ def delete_user(request, user_id):
             user.delete()
 
             # === NOTIFICATION: User deleted → notify admin & super_admin ===
-            for notifier in CustomUser.objects.filter(role__in=['admin', 'super_admin'], is_active=True):
-                create_notification(
-                    recipient=notifier,
-                    ntype='user_deleted',
-                    title='User Deleted',
-                    message=f"User {deleted_email} ({deleted_role}) was deleted by {request.user.get_full_name() or request.user.email}.",
-                )
+            notify_role(
+                ADMIN_ROLES,
+                ntype='user_deleted',
+                title='User Deleted',
+                message=f"User {deleted_email} ({deleted_role}) was deleted by {request.user.get_full_name() or request.user.email}.",
+            )
 
             messages.success(request, "User deleted successfully.")
 
@@ -189,40 +240,14 @@ def export_users_excel(request):
     if not has_permission(request.user, 'users', 'export'):
         return HttpResponse('Access Denied', status=403)
 
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = 'attachment; filename="users.xlsx"'
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Users"
-
-    columns = ['Full Name', 'Email', 'Phone', 'Department', 'Role', 'Status', 'Date Joined']
-    ws.append(columns)
-
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-
-    for user in CustomUser.objects.all():
-        ws.append([
-            user.full_name or '-',
-            user.email,
-            user.phone or '-',
-            user.get_department_display(),
-            user.get_role_display(),
-            user.get_status_display(),
-            user.date_joined.strftime('%Y-%m-%d')
-        ])
-
-    wb.save(response)
-    return response
+    return export_response(EXPORT_SCHEMAS['users'], 'xlsx', _export_params(request.GET))
 
 @login_required
 def dashboard(request):
     if not has_permission(request.user, 'dashboard', 'view'):
         return HttpResponse('Access Denied', status=403)
-    return render(request, 'employee_app/dashboard.html')
+    # read from the precomputed rollup, not live GROUP BYs
+    return render(request, 'employee_app/dashboard.html', {'metrics': dashboard_metrics()})
 
 
 
@@ -261,21 +286,19 @@ def profile(request):
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
-from django.contrib.sessions.models import Session
 from django.shortcuts import render, redirect
 from django.utils import timezone
 from django.views.decorators.http import require_POST
+from .models import UserSession
+from .utils import end_user_sessions
 
 
 @login_required
 def app_settings(request):
-    sessions = Session.objects.filter(expire_date__gte=timezone.now())
-    user_sessions = []
-
-    for session in sessions:
-        data = session.get_decoded()
-        if data.get('_auth_user_id') == str(request.user.id):
-            user_sessions.append(session)
+    user_sessions = UserSession.objects.filter(
+        user=request.user,
+        expire_date__gte=timezone.now()
+    )
 
     return render(request, 'employee_app/settings.html', {
         'active_sessions': user_sessions
@@ -305,7 +328,12 @@ def change_password(request):
 
     user.set_password(new_password)
     user.save()
+    old_session_key = request.session.session_key
     update_session_auth_hash(request, user)
+    # The session key is rotated; keep the session index pointing at it
+    UserSession.objects.filter(session_key=old_session_key).update(
+        session_key=request.session.session_key
+    )
 
     messages.success(request, "Password changed successfully")
     return redirect('employee_app:settings')
@@ -326,12 +354,7 @@ def change_password(request):
 @login_required
 @require_POST
 def sign_out_all_devices(request):
-    sessions = Session.objects.filter(expire_date__gte=timezone.now())
-
-    for session in sessions:
-        data = session.get_decoded()
-        if data.get('_auth_user_id') == str(request.user.id):
-            session.delete()
+    end_user_sessions(request.user)
 
     messages.success(request, "Signed out from all devices")
     return redirect('employee_app:settings')
@@ -361,6 +384,11 @@ from datetime import datetime
 from django.db.models import Q
 from .forms import BioDataForm
 from .models import BiodataInvitation
+from .storage import document_storage
+from .uploads import (
+    UPLOAD_CHUNK_SIZE, UPLOAD_FIELDS, UploadError, append_chunk, claim_upload, close_uploads, release_uploads,
+    slot_files, start_upload,
+)
 from employee_app.models import CustomUser  # adjust import if needed
 from employee_app.utils import create_notification  # assuming this exists
 from django.urls import reverse
@@ -371,15 +399,75 @@ from datetime import datetime
 from django.db.models import Q
 from .forms import BioDataForm
 from .models import BiodataInvitation
+from .storage import document_storage
 from employee_app.models import CustomUser  # adjust if needed
 from employee_app.utils import create_notification  # adjust if needed
 from django.urls import reverse
 
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods, require_POST
+from .models import ChunkedUpload
+
+@require_POST
+def public_upload_start(request):
+    try:
+        upload = start_upload(
+            request.POST.get('field', ''),
+            request.POST.get('filename', ''),
+            int(request.POST.get('size') or 0),
+            client=request.META.get('REMOTE_ADDR'),
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Invalid size.'}, status=400)
+    except UploadError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+
+    return JsonResponse({
+        'upload_id': str(upload.pk),
+        'offset': 0,
+        'chunk_size': UPLOAD_CHUNK_SIZE,
+        'upload_url': reverse('employee_app:public_upload_chunk', args=[upload.pk]),
+    }, status=201)
+
+
+@require_http_methods(['GET', 'POST'])
+def public_upload_chunk(request, upload_id):
+    """
+    GET reports how many bytes the server has (to resume after a dropped
+    connection); POST appends the raw request body at the Upload-Offset header.
+    """
+    if request.method == 'GET':
+        upload = get_object_or_404(ChunkedUpload, pk=upload_id)
+        return JsonResponse({'offset': upload.received, 'size': upload.size, 'status': upload.status})
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid Upload-Offset header.'}, status=400)
+
+    try:
+        upload = append_chunk(upload_id, offset, request.body)
+    except UploadError as e:
+        return JsonResponse({'error': str(e), 'offset': e.offset}, status=e.status)
+
+    return JsonResponse({'offset': upload.received, 'size': upload.size, 'status': upload.status})
+
+
 def public_biodata_form(request):
     form = BioDataForm()  # default empty form
 
     if request.method == 'POST':
-        form = BioDataForm(request.POST, request.FILES)  # bind data + files
+        # Files sent ahead through the chunked upload endpoint arrive as <field>_upload ids
+        files = request.FILES.copy()
+        claimed = []
+        for field in UPLOAD_FIELDS:
+            upload_id = request.POST.get(f'{field}_upload')
+            uploaded = claim_upload(upload_id, field) if upload_id else None
+            if uploaded:
+                files[field] = uploaded
+                claimed.append(uploaded)
+
+        form = BioDataForm(request.POST, files)  # bind data + files
 
         if form.is_valid():
             # Your existing work experience saving logic
@@ -388,7 +476,13 @@ def public_biodata_form(request):
             designations = request.POST.getlist('prev_designation[]')
             durations = request.POST.getlist('prev_duration[]')
             emails = request.POST.getlist('prev_email[]')
-            cert_files = request.FILES.getlist('work_experience_cert[]')
+            # one entry per experience block, merging chunked uploads with files posted inline
+            cert_files = slot_files(
+                request.POST.getlist('work_experience_cert_upload[]'),
+                request.FILES.getlist('work_experience_cert[]'),
+                'work_experience_cert',
+            )
+            claimed.extend(f for f in cert_files if getattr(f, 'upload_id', None))
 
             for i in range(len(employers)):
                 if employers[i].strip():
@@ -401,18 +495,19 @@ def public_biodata_form(request):
 
                     if i < len(cert_files) and cert_files[i]:
                         cert_file = cert_files[i]
-                        from django.core.files.storage import default_storage
-                        path = default_storage.save(
+                        path = document_storage.save(
                             f'biodata/certs/{cert_file.name}',
                             cert_file
                         )
-                        exp['certificate_path'] = default_storage.url(path)
+                        exp['certificate_name'] = path
+                        exp['certificate_path'] = document_storage.url(path)
 
                     work_exp.append(exp)
 
             bio = form.save(commit=False)
             bio.work_experience = work_exp
             bio.save()
+            release_uploads(claimed)
 
             # Track invitation submission
             submitted_email = bio.personal_email
@@ -425,15 +520,14 @@ def public_biodata_form(request):
                 invitation.save()
 
             # Notify admins
-            for user in CustomUser.objects.filter(role__in=['admin', 'super_admin'], is_active=True):
-                link = reverse('employee_app:review_biodata_detail', args=[bio.pk])
-                create_notification(
-                    recipient=user,
-                    ntype='biodata_new',
-                    title='New BioData Submission',
-                    message=f"{bio.first_name} {bio.last_name} submitted a new bio data request.",
-                    link=request.build_absolute_uri(link)
-                )
+            link = reverse('employee_app:review_biodata_detail', args=[bio.pk])
+            notify_role(
+                ADMIN_ROLES,
+                ntype='biodata_new',
+                title='New BioData Submission',
+                message=f"{bio.first_name} {bio.last_name} submitted a new bio data request.",
+                link=request.build_absolute_uri(link)
+            )
 
             messages.success(
                 request,
@@ -443,6 +537,7 @@ def public_biodata_form(request):
 
         else:
             # Form is invalid → show field errors + general message
+            close_uploads(claimed)
             messages.error(request, 'Please correct the errors below.')
 
     # Always pass form (bound or unbound) + years
@@ -459,14 +554,50 @@ def public_biodata_form(request):
     )
 
 
+from django.db.models import Count, Q
+
+REVIEW_QUEUE_PAGE_SIZE = 25
+REVIEW_QUEUE_COLUMNS = (
+    'id', 'first_name', 'middle_name', 'last_name', 'personal_email',
+    'contact_number', 'status', 'created_at',
+)
+
+
 @login_required
 def pending_requests(request):
-    requests = BioDataRequest.objects.all().order_by('-created_at')
-    return render(request, 'employee_app/pending_requests.html', {'requests': requests})
+    # One tab per status; pending is the review queue, the others are history
+    status = request.GET.get('status', 'pending')
+    if status not in dict(BioDataRequest.STATUS_CHOICES):
+        status = 'pending'
+    search = request.GET.get('search', '').strip()
+
+    queue = BioDataRequest.objects.filter(status=status).only(*REVIEW_QUEUE_COLUMNS)
+    if search:
+        queue = queue.filter(
+            Q(first_name__icontains=search) |
+            Q(last_name__icontains=search) |
+            Q(personal_email__icontains=search) |
+            Q(contact_number__icontains=search)
+        )
+    rows, next_cursor = keyset_page(queue, request.GET.get('after'), REVIEW_QUEUE_PAGE_SIZE, 'created_at')
+
+    counts = dict(BioDataRequest.objects.values_list('status').annotate(n=Count('pk')).order_by())
+    tabs = [(value, label, counts.get(value, 0)) for value, label in BioDataRequest.STATUS_CHOICES]
+
+    return render(request, 'employee_app/pending_requests.html', {
+        'requests': rows,
+        'status': status,
+        'search': search,
+        'tabs': tabs,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
+    })
 
 
 import secrets
 import string
+from django.db import transaction
+from .mailer import queue_email
 @login_required
 def review_biodata_detail(request, pk):
     bio = get_object_or_404(BioDataRequest, pk=pk)
@@ -477,35 +608,39 @@ def review_biodata_detail(request, pk):
             action = request.POST.get('action')
             create_account = form.cleaned_data.get('create_account', True)
 
-            bio = form.save(commit=False)
-
-            if action == 'approve':
-                bio.status = 'approved'
-                bio.approved_by = request.user
-
-                if create_account and not bio.user:
-                    email = bio.official_email or bio.personal_email
-                    if CustomUser.objects.filter(email=email).exists():
-                        messages.error(request, f"Email {email} already used.")
-                    else:
-                        temp_password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(10))
-                        new_user = CustomUser.objects.create(
-                            email=email,
-                            full_name=f"{bio.first_name} {bio.middle_name or ''} {bio.last_name}".strip(),
-                            phone=bio.contact_number,  # COPY PHONE
-                            department=bio.department,  # COPY DEPARTMENT
-                            role='employee',
-                            status='active',
-                            password=make_password(temp_password),
-                            is_active=True
-                        )
-                        bio.user = new_user
-                        bio.save()
+            # Account, approval and welcome mail commit or roll back together
+            with transaction.atomic():
+                bio = form.save(commit=False)
+
+                if action == 'approve':
+                    bio.status = 'approved'
+                    bio.approved_by = request.user
+                    if bio.approved_at is None:
+                        bio.approved_at = timezone.now()
+
+                    if create_account and not bio.user:
+                        email = bio.official_email or bio.personal_email
+                        if CustomUser.objects.filter(email=email).exists():
+                            messages.error(request, f"Email {email} already used.")
+                        else:
+                            temp_password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(10))
+                            new_user = CustomUser.objects.create(
+                                email=email,
+                                full_name=f"{bio.first_name} {bio.middle_name or ''} {bio.last_name}".strip(),
+                                phone=bio.contact_number,  # COPY PHONE
+                                department=bio.department,  # COPY DEPARTMENT
+                                role='employee',
+                                status='active',
+                                password=make_password(temp_password),
+                                is_active=True
+                            )
+                            bio.user = new_user
+                            bio.save()
 
                        
-                        # Send welcome email
-                        subject = 'Welcome to STACKLY - Your Account Details'
-                        message = f"""
+                            # Queue welcome email (delivered by the outbox worker)
+                            subject = 'Welcome to STACKLY - Your Account Details'
+                            message = f"""
                         Dear {bio.first_name} {bio.last_name},
 
                         Your bio data has been approved!
@@ -527,24 +662,23 @@ def review_biodata_detail(request, pk):
                         Best regards,
                         HR Team - STACKLY
                         """
-                        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [bio.personal_email])
+                            queue_email(subject, message, [bio.personal_email])
 
-                        # Notify admins
-                        for notifier in CustomUser.objects.filter(role__in=['admin', 'super_admin']):
-                            create_notification(
-                                notifier,
+                            # Notify admins
+                            notify_role(
+                                ADMIN_ROLES,
                                 'employee_account_created',
                                 'Employee Account Created',
                                 f"Account created for {bio.first_name} {bio.last_name} ({email}) on approval.",
                                 reverse('employee_app:edit_user', args=[new_user.id])
                             )
 
-                messages.success(request, 'Employee approved successfully!' + (' Account created.' if create_account else ''))
-            elif action == 'reject':
-                bio.status = 'rejected'
-                messages.success(request, 'Application rejected successfully.')
+                    messages.success(request, 'Employee approved successfully!' + (' Account created.' if create_account else ''))
+                elif action == 'reject':
+                    bio.status = 'rejected'
+                    messages.success(request, 'Application rejected successfully.')
 
-            bio.save()
+                bio.save()
             return redirect('employee_app:pending_requests')
 
     else:
@@ -553,30 +687,17 @@ def review_biodata_detail(request, pk):
     return render(request, 'employee_app/review_biodata_detail.html', {'bio': bio, 'form': form})
 
 from django.db.models import Q
+from .exports import approved_employees
 
 @login_required
 def biodata_list(request):
-    employees = BioDataRequest.objects.filter(status='approved').order_by('-doj')
-
     # Get filter parameters from URL
     search = request.GET.get('search', '').strip()
     department = request.GET.get('department', '').strip()
 
-    # Apply search filter (name, email, employee_id)
-    if search:
-        employees = employees.filter(
-            Q(first_name__icontains=search) |
-            Q(middle_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(employee_id__icontains=search) |
-            Q(official_email__icontains=search) |
-            Q(personal_email__icontains=search)
-        )
+    # Full-text search (names, emails, employee_id, skills, designation) + department filter
+    employees = approved_employees(search, department)
 
-    # Apply department filter
-    if department:
-        employees = employees.filter(department=department)
-    
     invitations = BiodataInvitation.objects.all().order_by('-sent_at')
 
     context = {
@@ -587,6 +708,46 @@ def biodata_list(request):
     }
     return render(request, 'employee_app/biodata.html', context)
 
+
+from .talent import find_talent
+
+TALENT_RESULT_LIMIT = 100
+
+
+@login_required
+def talent_search(request):
+    """
+    Approved employees by skill and employment history, e.g.
+    ?skills=django,react&min_employers=2 (optionally &employers=infosys,tcs).
+    """
+    if not has_permission(request.user, 'biodata', 'view'):
+        return HttpResponse('Access Denied', status=403)
+
+    split = lambda key: [v for v in request.GET.get(key, '').split(',') if v.strip()]
+    try:
+        min_employers = max(int(request.GET.get('min_employers') or 0), 0)
+    except ValueError:
+        return JsonResponse({'error': 'min_employers must be a number.'}, status=400)
+
+    employees = find_talent(
+        skills=split('skills'),
+        employers=split('employers'),
+        min_employers=min_employers,
+        queryset=BioDataRequest.objects.filter(status='approved'),
+    ).order_by('first_name', 'last_name', 'pk').only(
+        'first_name', 'last_name', 'employee_id', 'designation', 'department',
+    )[:TALENT_RESULT_LIMIT]
+
+    return JsonResponse({
+        'employees': [{
+            'id': bio.pk,
+            'name': f"{bio.first_name} {bio.last_name}",
+            'employee_id': bio.employee_id,
+            'designation': bio.designation,
+            'department': bio.department,
+        } for bio in employees],
+    })
+
 from django.core.mail import send_mail
 from django.conf import settings
 from .models import BiodataInvitation
@@ -599,6 +760,8 @@ from django.contrib import messages
 from django.shortcuts import redirect
 from django.db.models import Q
 from django.http import HttpResponseForbidden
+from .forms import InvitationImportForm
+from .invitations import SKIP_REASONS, import_invitations, read_invitation_file
 from .models import BiodataInvitation, BioDataRequest
 from employee_app.models import CustomUser  # Import your User model (adjust path if needed)
 
@@ -634,18 +797,57 @@ def send_biodata_invitation(request):
             return redirect('employee_app:biodata_list')
 
         # Create invitation record
-        invitation = BiodataInvitation.objects.create(
-            name=name,
-            email=email,
-            phone=phone
+        with transaction.atomic():
+            BiodataInvitation.objects.create(
+                name=name,
+                email=email,
+                phone=phone
+            )
+            public_link = request.build_absolute_uri(reverse('employee_app:public_biodata_form'))
+            queue_email(*invitation_email(name, public_link), [email])
+
+        messages.success(request, f"Invitation sent successfully to {email}!")
+
+    return redirect('employee_app:biodata_list')
+
+
+@login_required
+@require_POST
+def import_biodata_invitations(request):
+    if request.user.role not in ['super_admin', 'admin']:
+        return HttpResponseForbidden("Only admins can send invitations.")
+
+    form = InvitationImportForm(request.POST, request.FILES)
+    if not form.is_valid():
+        messages.error(request, ' '.join(form.errors.get('file', ['Please upload a CSV or XLSX file.'])))
+        return redirect('employee_app:biodata_list')
+
+    public_link = request.build_absolute_uri(reverse('employee_app:public_biodata_form'))
+    try:
+        accepted, skipped = import_invitations(
+            read_invitation_file(form.cleaned_data['file']),
+            lambda name: invitation_email(name, public_link),
         )
+    except (ValueError, UnicodeDecodeError) as e:
+        messages.error(request, f"Could not read the file: {e}")
+        return redirect('employee_app:biodata_list')
+
+    messages.success(request, f"{accepted} invitation(s) queued.")
+    skipped_summary = ', '.join(
+        f"{count} {SKIP_REASONS[reason]}" for reason, count in skipped.items() if count
+    )
+    if skipped_summary:
+        messages.warning(request, f"Skipped: {skipped_summary}.")
+
+    return redirect('employee_app:biodata_list')
 
-        # Public link
-        public_link = request.build_absolute_uri(reverse('employee_app:public_biodata_form'))
 
-        # Email content
-        subject = "Invitation to Fill Employee Bio Data Form - STACKLY"
-        message = f"""
+def invitation_email(name, public_link):
+    """
+    Subject and body of the bio data form invitation.
+    """
+    subject = "Invitation to Fill Employee Bio Data Form - STACKLY"
+    message = f"""
 Dear {name},
 
 You are invited to fill your employee bio data form.
@@ -664,21 +866,7 @@ If you have any questions, contact HR.
 Thank you!
 STACKLY HR Team
         """
-
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [email],
-                fail_silently=False,
-            )
-            messages.success(request, f"Invitation sent successfully to {email}!")
-        except Exception as e:
-            messages.error(request, f"Failed to send email: {str(e)}")
-            invitation.delete()  # rollback if email fails
-
-    return redirect('employee_app:biodata_list')
+    return subject, message
 
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
@@ -745,26 +933,34 @@ def view_biodata(request, pk):
     bio = get_object_or_404(BioDataRequest, pk=pk, status='approved')
     return render(request, 'employee_app/view_biodata.html', {'bio': bio})
 
+from collections import Counter
 from .forms import BioDataEditForm
 @login_required
 def edit_biodata(request, pk):
     bio = get_object_or_404(BioDataRequest, pk=pk, status='approved')
 
     if request.method == 'POST':
+        previous_files = {f: getattr(bio, f).name for f in BioDataRequest.DOCUMENT_FIELDS}
+        previous_certificates = bio.certificate_names()
         form = BioDataEditForm(request.POST, request.FILES, instance=bio)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
+                # every re-saved field took a new reference, even when the same bytes
+                # map back to the same name, so the old one is always dropped
+                dropped = [previous_files[f] for f in BioDataRequest.DOCUMENT_FIELDS if f in form.changed_data]
+                dropped += (Counter(previous_certificates) - Counter(bio.certificate_names())).elements()
+                document_storage.release(dropped)
 
             # Notification
-            for notifier in CustomUser.objects.filter(role__in=['admin', 'super_admin'], is_active=True):
-                link = reverse('employee_app:view_biodata', args=[bio.pk])
-                create_notification(
-                    recipient=notifier,
-                    ntype='biodata_updated',
-                    title='Employee BioData Updated',
-                    message=f"BioData of {bio.first_name} {bio.last_name} (ID: {bio.employee_id or 'N/A'}) was updated by {request.user.get_full_name() or request.user.email}.",
-                    link=request.build_absolute_uri(link)
-                )
+            link = reverse('employee_app:view_biodata', args=[bio.pk])
+            notify_role(
+                ADMIN_ROLES,
+                ntype='biodata_updated',
+                title='Employee BioData Updated',
+                message=f"BioData of {bio.first_name} {bio.last_name} (ID: {bio.employee_id or 'N/A'}) was updated by {request.user.get_full_name() or request.user.email}.",
+                link=request.build_absolute_uri(link)
+            )
 
             messages.success(request, 'Employee bio data updated successfully!')
             return redirect('employee_app:view_biodata', pk=bio.pk)
@@ -787,13 +983,12 @@ def delete_biodata(request, pk):
         bio.delete()
 
         # === NOTIFICATION: BioData deleted → notify admin & super_admin ===
-        for notifier in CustomUser.objects.filter(role__in=['admin', 'super_admin'], is_active=True):
-            create_notification(
-                recipient=notifier,
-                ntype='biodata_deleted',
-                title='Employee BioData Deleted',
-                message=f"BioData of {deleted_name} ({deleted_email}) was deleted by {request.user.get_full_name() or request.user.email}.",
-            )
+        notify_role(
+            ADMIN_ROLES,
+            ntype='biodata_deleted',
+            title='Employee BioData Deleted',
+            message=f"BioData of {deleted_name} ({deleted_email}) was deleted by {request.user.get_full_name() or request.user.email}.",
+        )
 
         messages.success(request, f"BioData of {deleted_name} deleted successfully.")
         return redirect('employee_app:biodata_list')
@@ -803,115 +998,231 @@ def delete_biodata(request, pk):
 
 
 from datetime import datetime
-from openpyxl.styles import Font, Alignment
+from .media import can_access_media, media_response
 @login_required
 def export_biodata_excel(request):
     if not has_permission(request.user, 'biodata', 'export'):
         return HttpResponse('Access Denied', status=403)
 
-    employees = BioDataRequest.objects.filter(status='approved').order_by('-doj')
-
     # Apply the same filters as the list view
-    search = request.GET.get('search', '').strip()
-    department = request.GET.get('department', '').strip()
+    return export_response(EXPORT_SCHEMAS['biodata'], 'xlsx', _export_params(request.GET))
 
-    if search:
-        employees = employees.filter(
-            Q(first_name__icontains=search) |
-            Q(middle_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(employee_id__icontains=search) |
-            Q(official_email__icontains=search) |
-            Q(personal_email__icontains=search)
-        )
 
-    if department:
-        employees = employees.filter(department=department)
-
-    # Now build Excel with filtered employees
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Approved Employees"
-
-    columns = [
-        'ID', 'First Name', 'Middle Name', 'Last Name', 'Personal Email', 'Contact Number',
-        'Employee ID', 'Official Email', 'Designation', 'Department', 'DOJ', 'Work Mode',
-        'Experience Type', 'Post Applied For', 'Blood Group',
-        'Address', 'Aadhar No', 'PAN No',
-        'Bank Name', 'Branch', 'Account No', 'Account Name', 'IFSC',
-        'Technical Skills', 'Created At'
-    ]
-    ws.append(columns)
-
-    for col_num, cell in enumerate(ws[1], start=1):
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal='center')
-
-    for emp in employees:
-        address = f"{emp.address_line1 or ''} {emp.address_line2 or ''}, {emp.city or ''}, {emp.state or ''} {emp.postal_code or ''}, {emp.get_country_display() or ''}".strip()
-        ws.append([
-            emp.id,
-            emp.first_name,
-            emp.middle_name or '-',
-            emp.last_name,
-            emp.personal_email,
-            emp.contact_number,
-            emp.employee_id or '-',
-            emp.official_email or '-',
-            emp.designation or '-',
-            emp.department or '-',
-            emp.doj.strftime('%Y-%m-%d') if emp.doj else '-',
-            emp.work_mode or '-',
-            emp.get_experience_type_display(),
-            emp.get_post_applied_for_display() or '-',
-            emp.blood_group or '-',
-            address or '-',
-            emp.aadhar_no or '-',
-            emp.pan_no or '-',
-            emp.bank_name or '-',
-            emp.bank_branch or '-',
-            emp.account_number or '-',
-            emp.account_name or '-',
-            emp.ifsc_code or '-',
-            emp.technical_skills,
-            emp.created_at.strftime('%Y-%m-%d %H:%M'),
-        ])
-
-    # Auto width + freeze header (same as before)
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        ws.column_dimensions[column].width = max_length + 2
-    ws.freeze_panes = 'A2'
-
-    today = datetime.now().strftime('%Y-%m-%d')
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="approved_employees_{today}.xlsx"'
-    wb.save(response)
-    return response
+def _export_params(data):
+    return {key: data.get(key, '').strip() for key in ('search', 'department', 'role', 'status')}
+
+
+@login_required
+def export_data(request, schema, fmt):
+    """
+    Generic export endpoint, e.g. /exports/sessions.csv or
+    /exports/biodata.parquet?department=hr.
+    """
+    if schema not in EXPORT_SCHEMAS or fmt not in EXPORT_WRITERS:
+        return HttpResponse('Unknown export', status=404)
+    export_schema = EXPORT_SCHEMAS[schema]
+    if not has_permission(request.user, export_schema.permission, 'export'):
+        return HttpResponse('Access Denied', status=403)
+
+    return export_response(export_schema, fmt, _export_params(request.GET))
+
+
+
+from .export_jobs import enqueue_export
+from .models import ExportJob
+
+@login_required
+@require_POST
+def start_export(request, kind):
+    fmt = request.POST.get('format', 'xlsx')
+    if kind not in EXPORT_SCHEMAS or fmt not in EXPORT_WRITERS:
+        return HttpResponse('Unknown export', status=404)
+    if not has_permission(request.user, EXPORT_SCHEMAS[kind].permission, 'export'):
+        return HttpResponse('Access Denied', status=403)
+
+    # Carry the list page filters into the job
+    params = _export_params(request.POST)
+    params['format'] = fmt
+
+    job = enqueue_export(request.user, kind, params)
+    return JsonResponse({
+        'id': job.pk,
+        'status_url': reverse('employee_app:export_status', args=[job.pk]),
+    }, status=202)
+
+
+@login_required
+def export_status(request, pk):
+    job = get_object_or_404(ExportJob, pk=pk, requested_by=request.user)
+    return JsonResponse({
+        'id': job.pk,
+        'status': job.status,
+        'rows_processed': job.rows_processed,
+        'total_rows': job.total_rows,
+        'elapsed_seconds': job.elapsed_seconds,
+        'error': job.error,
+        'download_url': reverse('employee_app:download_export', args=[job.pk]) if job.status == 'completed' else None,
+    })
 
 
+@login_required
+def download_export(request, pk):
+    job = get_object_or_404(ExportJob, pk=pk, requested_by=request.user, status='completed')
+    return media_response(request, job.file.name, as_attachment=True)
+
+
+@login_required
+def protected_media(request, path):
+    if not can_access_media(request.user, path):
+        return HttpResponse('Access Denied', status=403)
+    return media_response(request, path)
+
+
+@login_required
+def photo_thumbnail(request, size, fmt, path):
+    """
+    A derivative of the photo at `path`, built on first request. Falls back
+    to the original when the photo can't be decoded.
+    """
+    if size not in THUMBNAIL_SIZES or fmt not in THUMBNAIL_FORMATS:
+        raise Http404
+    if not can_access_media(request.user, path):
+        return HttpResponse('Access Denied', status=403)
+    return media_response(request, ensure_thumbnail(path, size, fmt) or path)
+
 
 from django.http import JsonResponse
+from .models import Notification
+import asyncio
+import json
+from django.http import Http404, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from .notification_stream import broker
+from django.views.decorators.http import etag, require_GET
+from .utils import get_notification_header, mark_notifications_read
 
 @login_required
 @require_POST
 def mark_all_read(request):
-    request.user.notifications.update(is_read=True)
+    mark_notifications_read(request.user)
     return JsonResponse({'status': 'ok'})
 
+@login_required
+@require_POST
+def open_notification(request, pk):
+    notif = get_object_or_404(Notification, pk=pk, recipient=request.user)
+    if not notif.is_read:
+        mark_notifications_read(request.user, [notif.pk])
+    return redirect(notif.link or 'employee_app:notifications_all')
+
+NOTIFICATION_POLL_LIMIT = 50
+
+
+def _notification_poll_cursor(request):
+    since = request.GET.get('since', '').strip()
+    if since.isdigit():
+        return {'pk__gt': int(since)}
+    since_dt = parse_datetime(since) if since else None
+    if since_dt:
+        if timezone.is_naive(since_dt):
+            since_dt = timezone.make_aware(since_dt)
+        return {'created_at__gt': since_dt}
+    return {}
+
+
+def _notification_poll_etag(request):
+    if not request.user.is_authenticated:
+        return None
+    unread_count, recent = get_notification_header(request.user)
+    latest_id = recent[0]['id'] if recent else 0
+    return f"{latest_id}-{unread_count}-{request.GET.get('since', '')}"
+
+
+@login_required
+@require_GET
+@etag(_notification_poll_etag)
+def notifications_poll(request):
+    """
+    Incremental feed for the navbar bell. Returns notifications newer than
+    the `since` cursor (an id or ISO timestamp); unchanged feeds get a 304.
+    """
+    unread_count, recent = get_notification_header(request.user)
+    cursor = _notification_poll_cursor(request)
+
+    latest_id = recent[0]['id'] if recent else 0
+
+    notifications = []
+    # The cached feed already tells us when an id cursor is up to date
+    if cursor.get('pk__gt', -1) < latest_id:
+        notifications = list(
+            Notification.objects.filter(recipient=request.user, **cursor)
+            .order_by('-created_at')
+            .values('id', 'title', 'link', 'is_read', 'created_at')
+            [:NOTIFICATION_POLL_LIMIT]
+        )
+
+    return JsonResponse({
+        'unread': unread_count,
+        'cursor': notifications[0]['id'] if notifications else request.GET.get('since', ''),
+        'notifications': notifications,
+    })
+
+NOTIFICATION_STREAM_KEEPALIVE = 25
+
+
+async def notifications_stream(request):
+    """
+    Server-Sent Events feed of new notifications. Runs as an async view so
+    idle connections only hold a queue on the event loop (serve through
+    the ASGI application, e.g. uvicorn/daphne, and set
+    NOTIFICATION_STREAM_ENABLED).
+    """
+    if not getattr(settings, 'NOTIFICATION_STREAM_ENABLED', False):
+        # under WSGI an endless stream would hold a worker thread; clients poll instead
+        raise Http404
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+
+    async def events():
+        entry = broker.subscribe(user.pk)
+        queue = entry[1]
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), NOTIFICATION_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"event: notification\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            broker.unsubscribe(user.pk, entry)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+NOTIFICATIONS_PAGE_SIZE = 25
+
 @login_required
 def notifications_all(request):
-    notifs = request.user.notifications.all()
-    return render(request, 'employee_app/notifications_all.html', {'notifications': notifs})
+    # Keyset pagination on id: `?before=<id>` shows the next older page
+    notifs = Notification.objects.filter(recipient=request.user).order_by('-pk')
+    before = request.GET.get('before', '')
+    if before.isdigit():
+        notifs = notifs.filter(pk__lt=int(before))
+
+    notifs = list(notifs[:NOTIFICATIONS_PAGE_SIZE + 1])
+    has_more = len(notifs) > NOTIFICATIONS_PAGE_SIZE
+    notifs = notifs[:NOTIFICATIONS_PAGE_SIZE]
+
+    return render(request, 'employee_app/notifications_all.html', {
+        'notifications': notifs,
+        'next_cursor': notifs[-1].pk if has_more else None,
+        'is_first_page': not before,
+    })
 
 from .models import CustomUser, BioDataRequest, Notification
 from .forms import BioDataForm, ReviewForm,  EmployeeProfileForm
@@ -984,7 +1295,29 @@ from .forms import (
 )
 
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q
+from django.db.models import Count, Func, IntegerField, Q, Subquery
+
+def _scalar_count(queryset, expression='pk', distinct=False):
+    template = '%(function)s(DISTINCT %(expressions)s)' if distinct else '%(function)s(%(expressions)s)'
+    return Subquery(
+        queryset.order_by().annotate(n=Func(expression, function='COUNT', template=template)).values('n'),
+        output_field=IntegerField(),
+    )
+
+
+def _training_stats(user):
+    """
+    The four quick stats of the training dashboard as scalar subqueries of
+    a single SELECT (anchored on the signed-in user's row).
+    """
+    enrollments = Batch.employees.through.objects.filter(customuser__role='employee')
+    return CustomUser.objects.filter(pk=user.pk).values(
+        active_batches_count=_scalar_count(Batch.objects.filter(status='ongoing')),
+        total_sessions=_scalar_count(Session.objects.all()),
+        pending_assignments=_scalar_count(Assignment.objects.filter(status='pending')),
+        enrolled_employees=_scalar_count(enrollments, 'customuser_id', distinct=True),
+    ).get()
+
 
 @login_required
 def training_dashboard(request):
@@ -995,7 +1328,11 @@ def training_dashboard(request):
     search_query = request.GET.get('q', '').strip()
 
     # ───── Batches ─────
-    batches_qs = Batch.objects.all().order_by('-start_date')
+    batches_qs = (
+        Batch.objects.annotate(employee_count=Count('employees', distinct=True))
+        .prefetch_related('trainers')
+        .order_by('-start_date')
+    )
     if search_query:
         batches_qs = batches_qs.filter(
             Q(name__icontains=search_query) |
@@ -1011,7 +1348,7 @@ def training_dashboard(request):
         batches = batches_paginator.page(batches_paginator.num_pages)
 
     # ───── Sessions ───── (newest first)
-    sessions_qs = Session.objects.all().order_by('-date_time')
+    sessions_qs = Session.objects.select_related('batch').order_by('-date_time')
     if search_query:
         sessions_qs = sessions_qs.filter(
             Q(title__icontains=search_query) |
@@ -1027,7 +1364,7 @@ def training_dashboard(request):
         sessions = sessions_paginator.page(sessions_paginator.num_pages)
 
     # ───── Assignments ───── (newest due date first)
-    assignments_qs = Assignment.objects.all().order_by('-due_date')
+    assignments_qs = Assignment.objects.select_related('batch', 'session').order_by('-due_date')
     if search_query:
         assignments_qs = assignments_qs.filter(
             Q(title__icontains=search_query) |
@@ -1048,11 +1385,7 @@ def training_dashboard(request):
         'assignments': assignments,
         'is_management_view': True,
         'search_query': search_query,  # to show in search box
-        # Quick stats (unchanged)
-        'active_batches_count': Batch.objects.filter(status='ongoing').count(),
-        'total_sessions': Session.objects.count(),
-        'pending_assignments': Assignment.objects.filter(status='pending').count(),
-        'enrolled_employees': CustomUser.objects.filter(role='employee', enrolled_batches__isnull=False).distinct().count(),
+        **_training_stats(request.user),
     }
 
     return render(request, 'employee_app/training.html', context)
@@ -1067,16 +1400,21 @@ def my_training(request):
         # Redirect admins/trainers to management dashboard
         return redirect('employee_app:training_admin_dashboard')
 
-    my_batches = Batch.objects.filter(employees=request.user).order_by('-start_date')
+    my_batches = (
+        Batch.objects.filter(employees=request.user)
+        .with_progress()
+        .prefetch_related('trainers')
+        .order_by('-start_date')
+    )
     upcoming_sessions = Session.objects.filter(
         batch__employees=request.user,
         date_time__gte=timezone.now()
-    ).order_by('date_time')[:5]
+    ).select_related('batch').order_by('date_time')[:5]
 
     pending_assignments = Assignment.objects.filter(
         batch__employees=request.user,
         status='pending'
-    ).order_by('due_date')
+    ).select_related('batch', 'session').order_by('due_date')
 
     context = {
         'my_batches': my_batches,
@@ -47,6 +47,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'employee_app.middleware.UserSessionMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -83,6 +84,65 @@ WSGI_APPLICATION = 'employee_dashboard.wsgi.application'
 # }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Holds per-user notification counters, thumbnails, throttles and sessions.
+# In production set CACHE_REDIS_URL (e.g. 'redis://127.0.0.1:6379'): Redis is
+# shared by every worker on every host and its incr() is atomic. Without it
+# the caches fall back to files, shared by the workers of one host only;
+# FileBasedCache lists its whole directory on every set() and its incr() is
+# get-then-set, so the entry caps stay small and the notification counters
+# are only eventually correct (they expire after NOTIFICATION_CACHE_TIMEOUT).
+
+CACHE_REDIS_URL = None
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': 'default',
+        },
+        # Shared between worker processes so "sign out all devices" evicts
+        # sessions everywhere.
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': 'sessions',
+            'TIMEOUT': 60 * 60 * 24 * 14,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache' / 'default',
+            'OPTIONS': {
+                'MAX_ENTRIES': 2000,
+            },
+        },
+        # cached_db falls back to the django_session table on a miss, so a
+        # small cap only costs the occasional extra query
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache' / 'sessions',
+            'TIMEOUT': 60 * 60 * 24 * 14,
+            'OPTIONS': {
+                'MAX_ENTRIES': 2000,
+            },
+        },
+    }
+
+
+# Sessions
+# Reads are served from the 'sessions' cache and only fall back to the
+# django_session table on a miss; writes go to both (write-through, so a
+# cache eviction or restart never loses a login).
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -132,10 +192,35 @@ STATICFILES_DIRS = [
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Background exports: 'thread' runs jobs in an in-process pool (development),
+# 'worker' leaves them for `manage.py run_export_worker`.
+EXPORT_JOB_RUNNER = 'thread' if DEBUG else 'worker'
+
+# Outgoing mail is queued in EmailOutbox; 'thread' flushes it right after
+# commit (development), 'worker' leaves it for `manage.py send_outbox`.
+EMAIL_OUTBOX_RUNNER = 'thread' if DEBUG else 'worker'
+
+# Chunked uploads from the public biodata form are assembled here (outside
+# MEDIA_ROOT, so partial files are never served) until the form is submitted.
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'uploads'
+
 # Media files (user-uploaded images)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media is served by employee_app's protected_media view after an access check.
+# In production set MEDIA_SENDFILE_MODE to 'x-accel-redirect' (nginx, with an
+# internal location at MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or 'x-sendfile'
+# (Apache/lighttpd) so the proxy streams the bytes instead of Django.
+MEDIA_SENDFILE_MODE = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+# Push notifications over Server-Sent Events (views.notifications_stream).
+# Only enable when serving through the ASGI application (uvicorn/daphne):
+# under WSGI each open stream would pin a worker thread for good. When off,
+# pages poll notifications_poll instead.
+NOTIFICATION_STREAM_ENABLED = False
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/login/'
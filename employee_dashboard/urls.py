@@ -17,11 +17,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from employee_app.views import protected_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('employee_app.urls')),
+    # Uploaded files go through an access check instead of django.conf.urls.static
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", protected_media, name='protected_media'),
 ]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)